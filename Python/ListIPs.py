@@ -1,28 +1,243 @@
 import ipaddress
+import argparse
+import array
 import csv
+import os
+import sys
+import time
+from itertools import islice
 
-def list_ips_in_network():
-    # Get input from the user for multiple subnets
-    input_subnets = input("Enter IP addresses with subnet masks separated by commas (e.g., 192.168.1.0/24,10.0.0.0/8): ")
-    subnets = [subnet.strip() for subnet in input_subnets.split(',')]
+# Parse a subnet string as an IPv4 or IPv6 network
+def parse_network(subnet_str):
+    return ipaddress.ip_network(subnet_str.strip(), strict=False)
 
+# Reduce the given subnets to sorted, non-overlapping blocks that cover
+# exactly their host addresses, so hosts shared by overlapping or duplicate
+# subnets are only emitted once. IPv4 blocks come before IPv6 blocks.
+def host_blocks(subnets):
+    blocks = {4: [], 6: []}
+    for subnet_str in subnets:
+        network = parse_network(subnet_str)
+        first, last = network.network_address, network.broadcast_address
+        # Skip the network and broadcast addresses in IPv4 and the
+        # subnet-router anycast address in IPv6, as hosts() does; the two
+        # longest prefixes have none to skip
+        if network.prefixlen < network.max_prefixlen - 1:
+            first += 1
+            if network.version == 4:
+                last -= 1
+        blocks[network.version].extend(ipaddress.summarize_address_range(first, last))
+    return list(ipaddress.collapse_addresses(blocks[4])) + list(ipaddress.collapse_addresses(blocks[6]))
+
+# Remove the given networks from the blocks; blocks that only partly
+# overlap an excluded network are split with address_exclude
+def exclude_blocks(blocks, excluded):
+    for exclusion in map(parse_network, excluded):
+        remaining = []
+        for block in blocks:
+            if block.version != exclusion.version or not block.overlaps(exclusion):
+                remaining.append(block)
+            elif not block.subnet_of(exclusion):
+                remaining.extend(block.address_exclude(exclusion))
+        blocks = remaining
+    return sorted(blocks, key=lambda block: (block.version, block.network_address))
+
+# Turn host blocks into inclusive (version, first, last) integer ranges,
+# joining blocks that touch
+def host_ranges(blocks):
+    ranges = []
+    for block in blocks:
+        first, last = int(block.network_address), int(block.broadcast_address)
+        if ranges and ranges[-1][0] == block.version and ranges[-1][2] + 1 == first:
+            ranges[-1] = (block.version, ranges[-1][1], last)
+        else:
+            ranges.append((block.version, first, last))
+    return ranges
+
+# Yield every host address in the given subnets as a string
+def hosts_in_networks(subnets):
+    for block in host_blocks(subnets):
+        for ip in block:
+            yield str(ip)
+
+# Stream IPs to a CSV file in fixed-size chunks and return how many were written
+def write_ips_csv(ips, path, chunk_size=65536):
+    count = 0
+    with open(path, 'w', newline='') as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(['IPs in the networks'])
+        while True:
+            chunk = list(islice(ips, chunk_size))
+            if not chunk:
+                break
+            csv_writer.writerows([ip] for ip in chunk)
+            count += len(chunk)
+    return count
+
+# Split integer ranges into pieces of at most batch_size addresses
+def range_batches(ranges, batch_size):
+    for version, first, last in ranges:
+        for start in range(first, last + 1, batch_size):
+            yield version, start, min(start + batch_size - 1, last)
+
+# Render a range of IPv4 addresses as dotted quads, one per line, each
+# wrapped in lead and terminator. Each /24 is built with a single join over
+# the precomputed last-octet strings, so no per-address objects or
+# formatting calls are involved.
+last_octets = [str(value) for value in range(256)]
+
+def render_range(first, last, terminator, lead=''):
+    parts = []
+    while first <= last:
+        end = min(last, first | 255)
+        prefix = f"{lead}{first >> 24}.{first >> 16 & 255}.{first >> 8 & 255}."
+        parts.append(prefix + (terminator + prefix).join(last_octets[first & 255:(end & 255) + 1]) + terminator)
+        first = end + 1
+    return ''.join(parts).encode()
+
+# IPv6 ranges are capped, so rendering them one address at a time is fine
+def render_range_ipv6(first, last, terminator, lead=''):
+    return ''.join(f"{lead}{ipaddress.IPv6Address(n)}{terminator}" for n in range(first, last + 1)).encode()
+
+# Pack a range as big-endian unsigned integers: 4 bytes per IPv4 address
+# and 16 per IPv6 address
+def pack_range(version, first, last):
+    if version == 6:
+        return b''.join(n.to_bytes(16, 'big') for n in range(first, last + 1))
+    packed = array.array('I', range(first, last + 1))
+    if sys.byteorder == 'little':
+        packed.byteswap()
+    return packed.tobytes()
+
+# Header, per-line lead and line terminator of each text output format
+text_formats = {
+    'csv': (b'IPs in the networks\r\n', '', '\r\n'),
+    'txt': (b'', '', '\n'),
+    'ndjson': (b'', '{"ip": "', '"}\n'),
+}
+output_formats = list(text_formats) + ['bin']
+
+# Write host ranges to an open binary file in large rendered blocks and
+# return the number of IPs written. The csv format is identical to
+# csv.writer's output; bin is a headerless array of big-endian integers
+# that downstream tools can mmap directly.
+def write_ranges(ranges, out, output_format='csv', batch_size=1 << 20):
+    header, lead, terminator = text_formats.get(output_format, (b'', '', ''))
+    out.write(header)
+    count = 0
+    for version, first, last in range_batches(ranges, batch_size):
+        if output_format == 'bin':
+            out.write(pack_range(version, first, last))
+        elif version == 4:
+            out.write(render_range(first, last, terminator, lead))
+        else:
+            out.write(render_range_ipv6(first, last, terminator, lead))
+        count += last - first + 1
+    return count
+
+def write_ranges_csv(ranges, path, batch_size=1 << 20):
+    with open(path, 'wb') as csvfile:
+        return write_ranges(ranges, csvfile, 'csv', batch_size)
+
+# Time the hosts()+csv path against the integer-range engine on one subnet
+# and check that they write the same file
+def benchmark(subnet='10.0.0.0/12'):
+    blocks = host_blocks([subnet])
+    engines = [("hosts() + csv.writer", lambda path: write_ips_csv(hosts_in_networks([subnet]), path)),
+               ("integer ranges", lambda path: write_ranges_csv(host_ranges(blocks), path))]
+
+    outputs = []
+    for name, engine in engines:
+        path = f'benchmark_{len(outputs)}.csv'
+        start = time.perf_counter()
+        count = engine(path)
+        seconds = time.perf_counter() - start
+        with open(path, 'rb') as f:
+            outputs.append(f.read())
+        os.remove(path)
+        print(f"{name:<30} {count} IPs in {seconds:.2f}s ({count / seconds / 1e6:.1f}M IPs/s)")
+    print("Outputs identical" if len(set(outputs)) == 1 else "Outputs differ")
+
+# Split subnet lists given as arguments or file lines on commas and
+# whitespace, dropping # comments
+def split_subnets(lines):
+    for line in lines:
+        for subnet in line.split('#', 1)[0].replace(',', ' ').split():
+            yield subnet
+
+def read_subnets(values, files=()):
+    subnets = list(split_subnets(value for value in values if value != '-'))
+    if '-' in values:
+        subnets.extend(split_subnets(sys.stdin))
+    for path in files:
+        if path == '-':
+            subnets.extend(split_subnets(sys.stdin))
+        else:
+            with open(path) as f:
+                subnets.extend(split_subnets(f))
+    return subnets
+
+def list_ips_in_network(subnets=None, excluded=(), output_format='csv', output='IPs.csv', max_ipv6=1 << 24):
+    if subnets is None:
+        # Get input from the user for multiple subnets
+        input_subnets = input("Enter IP addresses with subnet masks separated by commas (e.g., 192.168.1.0/24,10.0.0.0/8): ")
+        subnets = [subnet.strip() for subnet in input_subnets.split(',')]
+
+    # Report on stderr when the IPs themselves go to stdout
+    report = sys.stderr if output == '-' else sys.stdout
     try:
-        # List all IPs in the provided subnets
-        all_ips = []
-        for subnet_str in subnets:
-            network = ipaddress.IPv4Network(subnet_str, strict=False)
-            all_ips.extend([str(ip) for ip in network.hosts()])
+        # Validate and merge the subnets before anything is written
+        ranges = host_ranges(exclude_blocks(host_blocks(subnets), excluded))
+        ipv6_count = sum(last - first + 1 for version, first, last in ranges if version == 6)
+        if ipv6_count > max_ipv6:
+            raise ValueError(f"{ipv6_count} IPv6 addresses requested, more than the limit of {max_ipv6} (see --max-ipv6)")
+        if output_format == 'bin' and len({version for version, first, last in ranges}) > 1:
+            raise ValueError("The bin format cannot mix IPv4 and IPv6 addresses")
 
-        # Write the IPs to a CSV file
-        with open('IPs.csv', 'w', newline='') as csvfile:
-            csv_writer = csv.writer(csvfile)
-            csv_writer.writerow(['IPs in the networks'])
-            csv_writer.writerows(map(lambda x: [x], all_ips))
+        # Write the IPs to the output file
+        if output == '-':
+            count = write_ranges(ranges, sys.stdout.buffer, output_format)
+            sys.stdout.flush()
+        else:
+            with open(output, 'wb') as out:
+                count = write_ranges(ranges, out, output_format)
 
-        print(f"\nIPs in the provided networks have been written to IPs.csv.")
+        print(f"\n{count} IPs in the provided networks have been written to {'stdout' if output == '-' else output}.",
+              file=report)
 
     except ValueError as e:
-        print(f"Error: {e}")
+        print(f"Error: {e}", file=report)
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="List every host address in one or more subnets.")
+    parser.add_argument('subnets', nargs='*',
+                        help="Subnets such as 192.168.1.0/24 or 2001:db8::/120 ('-' reads them from stdin); "
+                             "prompted for if none are given")
+    parser.add_argument('-f', '--file', action='append', default=[],
+                        help="File of subnets, one or more per line ('-' for stdin); may be repeated")
+    parser.add_argument('-x', '--exclude', action='append', default=[], help='Subnet to leave out; may be repeated')
+    parser.add_argument('--exclude-file', action='append', default=[], help='File of subnets to leave out')
+    parser.add_argument('--format', choices=output_formats, default='csv',
+                        help='Output format; bin is packed big-endian uint32 (IPv4) or uint128 (IPv6) (default: %(default)s)')
+    parser.add_argument('-o', '--output', help="Output file, or '-' for stdout (default: IPs.<format>)")
+    parser.add_argument('--max-ipv6', type=int, default=1 << 24,
+                        help='Refuse to expand more IPv6 addresses than this (default: %(default)s)')
+    parser.add_argument('--benchmark', nargs='?', const='10.0.0.0/12', metavar='SUBNET',
+                        help='Compare the hosts()+csv path with the integer-range engine and exit')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return 0
+
+    subnets = None
+    if args.subnets or args.file:
+        subnets = read_subnets(args.subnets, args.file)
+    excluded = read_subnets(args.exclude, args.exclude_file)
+    output = args.output or f"IPs.{args.format}"
+    return list_ips_in_network(subnets, excluded, args.format, output, args.max_ipv6)
 
 if __name__ == "__main__":
-    list_ips_in_network()
+    sys.exit(main())
@@ -1,32 +1,598 @@
 import openpyxl
+import argparse
 import csv
+import datetime
+import glob
+import json
+import os
+import posixpath
+import shutil
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import chain, islice
+from xml.etree import ElementTree
+from xml.etree.ElementTree import iterparse
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
 
-def excel_to_csv(input_file, output_file):
-    # Load the workbook
-    workbook = openpyxl.load_workbook(input_file, data_only=True)
+# pyarrow is optional; without it the parquet output format is unavailable
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
-    # Get the sheet names and remove the first sheet
-    sheets = workbook.sheetnames
-    first_sheet_name = sheets[0]
-    del workbook[first_sheet_name]
-    print(f"Deleted the first sheet: {first_sheet_name}")  # Debugging output
+# -------------------------
+# Direct XML reader engine
+# -------------------------
+main_ns = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+relationship_ns = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+package_ns = '{http://schemas.openxmlformats.org/package/2006/relationships}'
 
-    # Open the output CSV file for writing
-    with open(output_file, mode='w', newline='', encoding='utf-8') as csv_file:
-        csv_writer = csv.writer(csv_file)
+row_tag = f'{main_ns}row'
+value_tag = f'{main_ns}v'
+sheet_data_tag = f'{main_ns}sheetData'
+dimension_tag = f'{main_ns}dimension'
+text_tag = f'{main_ns}t'
 
-        # Iterate through the remaining sheets
-        for sheet_name in workbook.sheetnames:
-            sheet = workbook[sheet_name]
+column_index = lru_cache(maxsize=None)(column_index_from_string)
 
-            # Write rows to the CSV
-            for row in sheet.iter_rows(values_only=True):
-                csv_writer.writerow(row)
+# Plain text of a shared or inline string: its own <t> plus the <t> of each
+# rich text run, leaving out phonetic runs
+def string_text(element):
+    if len(element) == 1 and element[0].tag == text_tag:
+        return element[0].text or ''
+    parts = [element.findtext(f'{main_ns}t')]
+    parts.extend(run.findtext(f'{main_ns}t') for run in element.iterfind(f'{main_ns}r'))
+    return ''.join(part for part in parts if part is not None)
+
+class XlsxSheet:
+    def __init__(self, reader, path):
+        self.reader = reader
+        self.path = path
+
+    # Rows of cell values laid out exactly as openpyxl's read-only
+    # iter_rows(values_only=True) returns them: from column A and row 1 up to
+    # the sheet's recorded dimension, with missing cells and rows as None
+    def iter_rows(self, values_only=True):
+        reader = self.reader
+        # Cell style ids (as they appear in the XML) of date and duration styles
+        date_styles = {str(style): style in reader.timedelta_formats for style in reader.date_formats}
+        epoch = reader.epoch
+        max_col = max_row = None
+        empty_row = []
+        counter = row_index = 1
+
+        with reader.archive.open(self.path) as source:
+            sheet_data = None
+            for event, element in iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == sheet_data_tag:
+                        sheet_data = element
+                    continue
+                tag = element.tag
+                if tag == dimension_tag:
+                    max_col, max_row = range_boundaries(element.get('ref'))[2:]
+                    if max_col is not None:
+                        empty_row = (None,) * max_col
+                    continue
+                if tag != row_tag:
+                    continue
+
+                ref = element.get('r')
+                row_index = int(ref) if ref else row_index + 1
+                if max_row is not None and row_index > max_row:
+                    break
+
+                # Convert the cells the way openpyxl does, placing each at its column
+                width = max_col
+                if width is None:
+                    # Without a recorded dimension a row ends at its last cell
+                    last = element[-1].get('r') if len(element) else None
+                    width = column_index(last.rstrip('0123456789')) if last else len(element)
+                row = [None] * width
+                column = 0
+                for cell in element:
+                    ref = cell.get('r')
+                    column = column_index(ref.rstrip('0123456789')) if ref else column + 1
+                    if column > width:
+                        continue
+                    data_type = cell.get('t')
+                    if data_type == 'inlineStr':
+                        inline = cell.find(f'{main_ns}is')
+                        row[column - 1] = None if inline is None else string_text(inline)
+                        continue
+                    value = cell.findtext(value_tag)
+                    if not value:
+                        continue
+                    if data_type is None or data_type == 'n':
+                        value = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+                        style = cell.get('s')
+                        if style in date_styles:
+                            try:
+                                value = from_excel(value, epoch, timedelta=date_styles[style])
+                            except (OverflowError, ValueError):
+                                value = '#VALUE!'
+                    elif data_type == 's':
+                        value = reader.shared_strings[int(value)]
+                    elif data_type == 'b':
+                        value = bool(int(value))
+                    elif data_type == 'd':
+                        value = from_ISO8601(value)
+                    row[column - 1] = value
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+                # Some rows are missing
+                for _ in range(counter, row_index):
+                    counter += 1
+                    yield empty_row
+
+                if counter <= row_index:
+                    counter += 1
+                    yield tuple(row)
+
+        if max_row is not None and max_row < row_index:
+            for _ in range(counter, max_row + 1):
+                yield empty_row
+
+# Reads worksheets straight from the .xlsx zip with iterparse, resolving the
+# shared strings table once per workbook and clearing each row as soon as it
+# has been converted. Offers the subset of openpyxl's read-only workbook
+# interface the converters use: sheetnames, workbook[name].iter_rows(
+# values_only=True) and close(). Cell values match openpyxl's for numbers,
+# dates, times, durations, booleans, shared and inline strings, errors and
+# cached formula results.
+class XlsxReader:
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path)
+        self._shared_strings = None
+
+        relationships, parts = self.read_relationships('xl/workbook.xml')
+        workbook = self.read_xml('xl/workbook.xml')
+        properties = workbook.find(f'{main_ns}workbookPr')
+        date1904 = properties is not None and properties.get('date1904') in ('1', 'true')
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+        self.sheets = {sheet.get('name'): relationships[sheet.get(f'{relationship_ns}id')]
+                       for sheet in workbook.iter(f'{main_ns}sheet')}
+        self.sheetnames = list(self.sheets)
+
+        self.shared_strings_path = parts.get('sharedStrings', 'xl/sharedStrings.xml')
+        self.date_formats, self.timedelta_formats = self.read_date_styles(parts.get('styles', 'xl/styles.xml'))
+
+    def read_xml(self, path):
+        with self.archive.open(path) as source:
+            return ElementTree.parse(source).getroot()
+
+    # Map the relationship ids of a part to the archive paths they point at,
+    # and the last segment of each relationship type (e.g. "styles") to its path
+    def read_relationships(self, part):
+        folder, name = posixpath.split(part)
+        path = posixpath.join(folder, '_rels', f'{name}.rels')
+        relationships, parts = {}, {}
+        for relationship in self.read_xml(path).iter(f'{package_ns}Relationship'):
+            target = relationship.get('Target')
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            relationships[relationship.get('Id')] = target
+            parts[relationship.get('Type').rsplit('/', 1)[-1]] = target
+        return relationships, parts
+
+    # Indexes of the cell styles whose number format shows a date or duration
+    def read_date_styles(self, path):
+        date_formats, timedelta_formats = set(), set()
+        if path not in self.archive.NameToInfo:
+            return date_formats, timedelta_formats
+        styles = self.read_xml(path)
+        custom = {int(fmt.get('numFmtId')): fmt.get('formatCode') for fmt in styles.iter(f'{main_ns}numFmt')}
+        cell_formats = styles.find(f'{main_ns}cellXfs')
+        for index, style in enumerate(cell_formats if cell_formats is not None else ()):
+            format_id = int(style.get('numFmtId', 0))
+            fmt = custom.get(format_id, BUILTIN_FORMATS.get(format_id))
+            if is_date_format(fmt):
+                date_formats.add(index)
+            if is_timedelta_format(fmt):
+                timedelta_formats.add(index)
+        return date_formats, timedelta_formats
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            self._shared_strings = []
+            if self.shared_strings_path in self.archive.NameToInfo:
+                with self.archive.open(self.shared_strings_path) as source:
+                    for event, element in iterparse(source):
+                        if element.tag == f'{main_ns}si':
+                            self._shared_strings.append(string_text(element).replace('x005F_', ''))
+                            element.clear()
+        return self._shared_strings
+
+    def __getitem__(self, sheet_name):
+        return XlsxSheet(self, self.sheets[sheet_name])
+
+    def close(self):
+        self.archive.close()
+
+# Workbook loaders by engine name; both return objects with the same
+# read-only interface
+engines = {
+    'openpyxl': lambda input_file: openpyxl.load_workbook(input_file, read_only=True, data_only=True),
+    'xml': XlsxReader,
+}
+
+# Write rows to the CSV in chunks, so only chunk_rows rows are held in
+# memory at a time
+def write_rows(csv_writer, rows, chunk_rows=10000):
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            break
+        csv_writer.writerows(chunk)
+
+def excel_to_csv(input_file, output_file, chunk_rows=10000, engine='openpyxl'):
+    # Load the workbook in read-only mode so sheets are streamed from the
+    # file as they are read instead of being built in memory up front
+    workbook = engines[engine](input_file)
+
+    try:
+        # Get the sheet names and skip the first sheet without loading it
+        sheets = workbook.sheetnames
+        first_sheet_name = sheets[0]
+        print(f"Skipped the first sheet: {first_sheet_name}")  # Debugging output
+
+        # Open the output CSV file for writing
+        with open(output_file, mode='w', newline='', encoding='utf-8', buffering=1 << 20) as csv_file:
+            csv_writer = csv.writer(csv_file)
+
+            # Iterate through the remaining sheets
+            for sheet_name in sheets[1:]:
+                write_rows(csv_writer, workbook[sheet_name].iter_rows(values_only=True), chunk_rows)
+    finally:
+        # Read-only workbooks keep the file open until closed
+        workbook.close()
 
     print(f"Excel file '{input_file}' has been converted to CSV '{output_file}'.")
 
-# Example usage
-input_excel_file = r"C:\temp\TESTING\NAME.xlsx"
-output_csv_file = r"C:\temp\TESTING\NAME.csv"
+# -------------------------
+# Typed output formats
+# -------------------------
+# Rows per Parquet row group
+row_group_rows = 65536
+
+# Column names for a sheet: its first row when that row is all non-empty
+# text (the row is then consumed), otherwise column_1, column_2, ...
+def sheet_columns(rows):
+    first = next(rows, None)
+    if first is None:
+        return [], rows
+    if all(isinstance(value, str) and value for value in first):
+        names = []
+        for name in first:
+            unique = name
+            while unique in names:
+                unique += '_'
+            names.append(unique)
+        return names, rows
+    return [f'column_{index + 1}' for index in range(len(first))], chain([first], rows)
+
+# JSON encoding for the value types JSON lacks, tagged so loaders get the
+# type back without guessing: {"datetime": ...}, {"date": ...},
+# {"time": ...} or {"duration": seconds}
+def json_value(value):
+    if isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"date": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"time": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {"duration": value.total_seconds()}
+    raise TypeError(f"Cannot encode {type(value).__name__} value {value!r}")
+
+# Write a sheet as NDJSON: a {"sheet", "columns"} line, then one JSON array
+# of typed values per row. Files for several sheets concatenate cleanly.
+def write_ndjson(sheet_name, rows, output_file, chunk_rows=10000):
+    encode = json.JSONEncoder(default=json_value, ensure_ascii=False, separators=(',', ':')).encode
+    columns, rows = sheet_columns(rows)
+    with open(output_file, mode='w', encoding='utf-8', buffering=1 << 20) as json_file:
+        json_file.write(encode({"sheet": sheet_name, "columns": columns}) + '\n')
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            json_file.write(''.join(encode(row) + '\n' for row in chunk))
+
+# Arrow type for a single cell value. Every number is a float64, since
+# Excel stores numbers as doubles and a whole-number row group says nothing
+# about later ones; values of other types are written as text.
+def value_type(value):
+    if isinstance(value, bool):
+        return pyarrow.bool_()
+    if isinstance(value, (int, float)):
+        return pyarrow.float64()
+    if isinstance(value, datetime.datetime):
+        return pyarrow.timestamp('us')
+    if isinstance(value, datetime.date):
+        return pyarrow.date32()
+    if isinstance(value, datetime.time):
+        return pyarrow.time64('us')
+    if isinstance(value, datetime.timedelta):
+        return pyarrow.duration('us')
+    return pyarrow.string()
+
+# Arrow type shared by every value of a column: text if they mix types,
+# None if there are no values. pyarrow's own inference can't be used, as it
+# follows the first value and casts the rest (a 5 in a date column becomes
+# 1970-01-01 00:00:00.000005).
+def column_type(values):
+    types = {value_type(value) for value in values if value is not None}
+    if not types:
+        return None
+    return types.pop() if len(types) == 1 else pyarrow.string()
+
+# Build an Arrow array for a column. Without a type, it is taken from the
+# values, falling back to text for columns that mix types (or hold no
+# values). With one, the values must have that type, so a later row group
+# never gets silently cast (e.g. 19.99 to 19, or a number to a 1970 date).
+def column_array(values, arrow_type=None):
+    values_type = column_type(values)
+    if arrow_type is None:
+        try:
+            if values_type is not None and not pyarrow.types.is_string(values_type):
+                return pyarrow.array(values, type=values_type)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+            pass
+        arrow_type = pyarrow.string()
+    if values_type is None:
+        return pyarrow.nulls(len(values), arrow_type)
+    if pyarrow.types.is_string(arrow_type):
+        values = [None if value is None else str(value) for value in values]
+    elif values_type != arrow_type:
+        raise pyarrow.ArrowTypeError(f"expected {arrow_type}, found {values_type}")
+    return pyarrow.array(values, type=arrow_type)
+
+# Write a sheet as Parquet in row groups of row_group_rows rows. Column
+# types come from the first row group and later groups must match them.
+def write_parquet(sheet_name, rows, output_file, chunk_rows=row_group_rows):
+    if pyarrow is None:
+        raise RuntimeError("The parquet format needs pyarrow (pip install pyarrow)")
+    columns, rows = sheet_columns(rows)
+    schema = writer = None
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            width = max(len(row) for row in chunk)
+            if schema is None:
+                # Sheets without a recorded size have ragged rows
+                columns += [f'column_{index + 1}' for index in range(len(columns), width)]
+            elif width > len(columns):
+                raise ValueError(f"Sheet '{sheet_name}' has rows wider than its {len(columns)} columns "
+                                 f"after the first {chunk_rows} rows; use --format ndjson")
+            values = [list(column) for column in zip(*(tuple(row) + (None,) * (len(columns) - len(row)) for row in chunk))]
+            if schema is None:
+                arrays = [column_array(column) for column in values]
+                schema = pyarrow.schema([(name, array.type) for name, array in zip(columns, arrays)])
+                writer = pyarrow.parquet.ParquetWriter(output_file, schema)
+            else:
+                try:
+                    arrays = [column_array(column, field.type) for column, field in zip(values, schema)]
+                except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError) as e:
+                    raise ValueError(f"Sheet '{sheet_name}' changes a column's type after the first "
+                                     f"{chunk_rows} rows ({e}); use --format ndjson") from e
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+        if writer is None:
+            schema = pyarrow.schema([(name, pyarrow.string()) for name in columns])
+            writer = pyarrow.parquet.ParquetWriter(output_file, schema)
+    except Exception:
+        # Don't leave a truncated file behind
+        if writer is not None:
+            writer.close()
+            writer = None
+            os.remove(output_file)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_csv(sheet_name, rows, output_file, chunk_rows=10000):
+    with open(output_file, mode='w', newline='', encoding='utf-8', buffering=1 << 20) as csv_file:
+        write_rows(csv.writer(csv_file), rows, chunk_rows)
+
+# Writers by output format, and whether a workbook's sheets can be merged
+# into one file of that format
+output_writers = {'csv': write_csv, 'ndjson': write_ndjson, 'parquet': write_parquet}
+mergeable_formats = {'csv', 'ndjson'}
+
+# Convert a single sheet to its own output file; runs in a worker process.
+# A sheet that fails leaves no truncated output file behind.
+def convert_sheet(input_file, sheet_name, output_file, chunk_rows=10000, engine='openpyxl', output_format='csv'):
+    workbook = engines[engine](input_file)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        if output_format == 'parquet':
+            output_writers[output_format](sheet_name, rows, output_file)
+        else:
+            output_writers[output_format](sheet_name, rows, output_file, chunk_rows)
+    except Exception:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        raise
+    finally:
+        workbook.close()
+    return output_file
+
+def sheet_names(input_file, engine='openpyxl'):
+    workbook = engines[engine](input_file)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+# Concatenate per-sheet parts into one CSV in sheet order, removing the parts
+def merge_parts(parts, output_file):
+    try:
+        with open(output_file, 'wb') as csv_file:
+            for part in parts:
+                with open(part, 'rb') as f:
+                    shutil.copyfileobj(f, csv_file, 1 << 20)
+                os.remove(part)
+    except Exception:
+        # Don't leave a truncated file behind
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        raise
+
+# Expand files, glob patterns and directories (all .xlsx files inside) into
+# a list of workbooks, skipping Excel's ~$ lock files
+def expand_inputs(patterns):
+    input_files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, '*.xlsx')))
+        else:
+            matches = sorted(glob.glob(pattern)) or [pattern]
+        input_files.extend(path for path in matches if not os.path.basename(path).startswith('~$'))
+    return list(dict.fromkeys(input_files))
+
+# Convert every sheet after the first of each workbook in a process pool.
+# By default each workbook becomes one file: its sheets are converted in
+# parallel to part files that are then merged in sheet order, giving the
+# same file as excel_to_csv for CSV. With per_sheet, and always for
+# Parquet (one schema per file), each sheet keeps its own file.
+# Returns the number of workbooks that failed.
+def convert_files(input_files, output_dir=None, output_file=None, per_sheet=False, workers=None, chunk_rows=10000,
+                  engine='openpyxl', output_format='csv'):
+    per_sheet = per_sheet or output_format not in mergeable_formats
+    jobs = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for input_file in input_files:
+            try:
+                sheets = sheet_names(input_file, engine)
+            except Exception as e:
+                print(f"Error reading '{input_file}': {e}")
+                failed += 1
+                continue
+            print(f"Skipped the first sheet of '{input_file}': {sheets[0]}")
+
+            base = os.path.splitext(os.path.join(output_dir, os.path.basename(input_file)) if output_dir else input_file)[0]
+            combined = None if per_sheet else (output_file or f"{base}.{output_format}")
+            if per_sheet:
+                targets = [(sheet_name, f"{base}_{sheet_name}.{output_format}") for sheet_name in sheets[1:]]
+            else:
+                targets = [(sheet_name, f"{combined}.part{index}") for index, sheet_name in enumerate(sheets[1:])]
+            futures = [executor.submit(convert_sheet, input_file, sheet_name, path, chunk_rows, engine, output_format)
+                       for sheet_name, path in targets]
+            jobs.append((input_file, combined, targets, futures))
+
+        # Collect results in submission order so merges and messages are ordered
+        for input_file, combined, targets, futures in jobs:
+            try:
+                parts = [future.result() for future in futures]
+                if combined:
+                    merge_parts(parts, combined)
+                    print(f"Excel file '{input_file}' has been converted to {output_format.upper()} '{combined}'.")
+                else:
+                    for part in parts:
+                        print(f"Excel file '{input_file}' sheet has been converted to {output_format.upper()} '{part}'.")
+            except Exception as e:
+                print(f"Error converting '{input_file}': {e}")
+                failed += 1
+                if combined:
+                    # Stop the workbook's queued sheets and wait for running
+                    # ones, so no part is written after the cleanup
+                    for future in futures:
+                        future.cancel()
+                    wait(futures)
+                    for sheet_name, part in targets:
+                        if os.path.exists(part):
+                            os.remove(part)
+    return failed
+
+# Write a synthetic workbook: a small first sheet (skipped on conversion)
+# followed by a data sheet of mixed numbers, repeated and unique strings,
+# dates, times, booleans and blanks
+def make_benchmark_workbook(path, rows):
+    workbook = openpyxl.Workbook(write_only=True)
+    workbook.create_sheet('Summary').append(['Synthetic benchmark workbook', rows])
+    sheet = workbook.create_sheet('Data')
+    sheet.append(['id', 'region', 'label', 'amount', 'ratio', 'created', 'time', 'active', 'note'])
+    start = datetime.datetime(2020, 1, 1)
+    regions = ['North', 'South', 'East', 'West', 'Central']
+    for index in range(rows):
+        sheet.append([index, regions[index % 5], f'item {index}', index * 7 % 1000, index / 7,
+                      start + datetime.timedelta(minutes=index), datetime.time(index % 24, index % 60),
+                      index % 3 == 0, None if index % 4 else 'check'])
+    workbook.save(path)
+
+# Convert the same synthetic workbook with each engine, timing them and
+# checking that their CSV output is byte-identical
+def benchmark(rows=1000000):
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        workbook_path = os.path.join(folder, 'benchmark.xlsx')
+        start = time.perf_counter()
+        make_benchmark_workbook(workbook_path, rows)
+        print(f"Generated a {rows}-row workbook ({os.path.getsize(workbook_path) / 1048576:.1f} MB) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        outputs = {}
+        for engine in engines:
+            output_path = os.path.join(folder, f'{engine}.csv')
+            start = time.perf_counter()
+            excel_to_csv(workbook_path, output_path, engine=engine)
+            seconds = time.perf_counter() - start
+            with open(output_path, 'rb') as f:
+                outputs[engine] = f.read()
+            print(f"{engine:<10} {seconds:.2f}s ({rows / seconds:,.0f} rows/s)")
+    print("Outputs identical" if len(set(outputs.values())) == 1 else "Outputs differ")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Excel workbooks to CSV, skipping the first sheet of each.")
+    parser.add_argument('inputs', nargs='*', help='Workbooks, glob patterns (e.g. "exports/*.xlsx") or directories')
+    parser.add_argument('-o', '--output', help='Output file (only with a single input workbook)')
+    parser.add_argument('--output-dir', help='Directory for the output files (default: next to each workbook)')
+    parser.add_argument('--format', choices=list(output_writers), default='csv',
+                        help='Output format; ndjson and parquet keep numbers, booleans and dates typed and take '
+                             "each sheet's first row as column names. Parquet needs pyarrow and is always "
+                             'written per sheet (default: %(default)s)')
+    parser.add_argument('--per-sheet', action='store_true',
+                        help='Write one CSV per sheet (<workbook>_<sheet>.csv) instead of one per workbook')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--engine', choices=list(engines), default='openpyxl',
+                        help='Workbook reader; xml parses the sheet XML directly and is faster (default: %(default)s)')
+    parser.add_argument('--benchmark', nargs='?', type=int, const=1000000, metavar='ROWS',
+                        help='Compare the engines on a synthetic workbook of ROWS rows and exit')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return 0
+    if not args.inputs:
+        parser.error("at least one input workbook is required")
+
+    input_files = expand_inputs(args.inputs)
+    if args.output and (len(input_files) != 1 or args.per_sheet):
+        parser.error("--output needs exactly one input workbook and cannot be combined with --per-sheet")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.format == 'parquet' and pyarrow is None:
+        parser.error("--format parquet needs pyarrow (pip install pyarrow)")
+    if args.output and args.format not in mergeable_formats:
+        parser.error(f"--output cannot be used with --format {args.format}, which writes one file per sheet")
+    failed = convert_files(input_files, args.output_dir, args.output, args.per_sheet, args.workers,
+                           engine=args.engine, output_format=args.format)
+    return 1 if failed else 0
 
-excel_to_csv(input_excel_file, output_csv_file)
+if __name__ == "__main__":
+    sys.exit(main())
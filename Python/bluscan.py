@@ -1,4 +1,14 @@
-from bleak import BleakScanner
+import argparse
+import asyncio
+import json
+import time
+from collections import deque, namedtuple
+
+# bleak is only needed for real scans; replays work without it
+try:
+    from bleak import BleakScanner
+except ImportError:
+    BleakScanner = None
 
 # Scan Bluetooth devices and display their information
 async def scan_devices():
@@ -6,6 +16,184 @@ async def scan_devices():
     for device in devices:
         print(f"Device {device.name} at {device.address}, RSSI: {device.rssi}")
 
-# Run the scanner
-import asyncio
-asyncio.run(scan_devices())
+# One received advertisement
+Sighting = namedtuple('Sighting', 'time name rssi')
+
+# Per-device summary of the sightings currently buffered
+DeviceSummary = namedtuple('DeviceSummary', 'address name count last_rssi mean_rssi min_rssi max_rssi last_seen')
+
+# Keeps the most recent advertisements of each device in a fixed-size ring
+# buffer, so memory stays bounded however long the scanner runs. Devices not
+# heard from for forget_after seconds are dropped.
+class DeviceHistory:
+    def __init__(self, buffer_size=32, forget_after=300, clock=time.time):
+        self.buffer_size = buffer_size
+        self.forget_after = forget_after
+        self.clock = clock
+        self.devices = {}
+        self.received = 0
+
+    # Detection callback with the signature BleakScanner expects
+    def record(self, device, advertisement_data):
+        name = device.name or advertisement_data.local_name
+        sightings = self.devices.get(device.address)
+        if sightings is None:
+            sightings = self.devices[device.address] = deque(maxlen=self.buffer_size)
+        sightings.append(Sighting(self.clock(), name, advertisement_data.rssi))
+        self.received += 1
+
+    def summary(self):
+        now = self.clock()
+        for address in [address for address, sightings in self.devices.items()
+                        if now - sightings[-1].time > self.forget_after]:
+            del self.devices[address]
+
+        summaries = []
+        for address, sightings in self.devices.items():
+            rssis = [sighting.rssi for sighting in sightings if sighting.rssi is not None]
+            name = next((sighting.name for sighting in reversed(sightings) if sighting.name), None)
+            summaries.append(DeviceSummary(
+                address, name, len(sightings), sightings[-1].rssi,
+                sum(rssis) / len(rssis) if rssis else None, min(rssis, default=None), max(rssis, default=None),
+                sightings[-1].time))
+        # Strongest signal first
+        return sorted(summaries, key=lambda summary: summary.mean_rssi if summary.mean_rssi is not None else -999,
+                      reverse=True)
+
+# Stand-ins for bleak's BLEDevice and AdvertisementData carrying the fields used here
+Device = namedtuple('Device', 'address name')
+Advertisement = namedtuple('Advertisement', 'local_name rssi')
+
+# Scanner backend that replays advertisements recorded with --record (one
+# JSON object per line with t, address, name and rssi) through the detection
+# callback at their recorded pace, divided by speed. Has the same
+# start()/stop() interface as BleakScanner, so it can be injected in its place.
+class ReplayScanner:
+    def __init__(self, path, detection_callback, speed=1.0):
+        self.path = path
+        self.detection_callback = detection_callback
+        self.speed = speed
+        self.task = None
+        self.finished = asyncio.Event()
+
+    async def start(self):
+        self.task = asyncio.create_task(self.replay())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    async def replay(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                delay = started + event["t"] / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.detection_callback(Device(event["address"], event.get("name")),
+                                        Advertisement(event.get("name"), event.get("rssi")))
+        self.finished.set()
+
+# Wrap a detection callback so every advertisement is also appended to an
+# NDJSON recording that ReplayScanner can play back
+def recording_callback(callback, record_file):
+    started = time.monotonic()
+
+    def record(device, advertisement_data):
+        record_file.write(json.dumps({"t": round(time.monotonic() - started, 3), "address": device.address,
+                                      "name": device.name or advertisement_data.local_name,
+                                      "rssi": advertisement_data.rssi}) + "\n")
+        callback(device, advertisement_data)
+    return record
+
+def print_report(history, summaries):
+    print(f"[{time.strftime('%H:%M:%S')}] {len(summaries)} device(s), {history.received} advertisement(s) received")
+    for device in summaries:
+        mean = f"{device.mean_rssi:.1f}" if device.mean_rssi is not None else "No data"
+        print(f"Device {device.name} at {device.address}, RSSI: {device.last_rssi} "
+              f"(avg {mean}, min {device.min_rssi}, max {device.max_rssi} over {device.count} adverts)")
+    print()
+
+# Run a scanner continuously, feeding its detection callback into a
+# DeviceHistory and passing the aggregated view to report every interval
+# seconds. make_scanner builds the backend from the callback, so a fake
+# scanner can be injected; by default it is BleakScanner. Stops after
+# duration seconds, when a replay finishes, or on Ctrl+C.
+async def scan_continuous(interval=5.0, duration=None, buffer_size=32, forget_after=300,
+                          make_scanner=None, report=print_report, record_path=None):
+    history = DeviceHistory(buffer_size, forget_after)
+    make_scanner = make_scanner or (lambda callback: BleakScanner(detection_callback=callback))
+    record_file = open(record_path, 'a') if record_path else None
+    callback = recording_callback(history.record, record_file) if record_file else history.record
+    scanner = make_scanner(callback)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration if duration else None
+    finished = getattr(scanner, 'finished', None)
+    await scanner.start()
+    try:
+        while True:
+            wait = interval if deadline is None else min(interval, deadline - loop.time())
+            if finished is not None:
+                try:
+                    await asyncio.wait_for(finished.wait(), max(wait, 0))
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(max(wait, 0))
+            report(history, history.summary())
+            if (finished is not None and finished.is_set()) or (deadline is not None and loop.time() >= deadline):
+                break
+    finally:
+        await scanner.stop()
+        if record_file:
+            record_file.close()
+    return history
+
+# Command-line options for continuous scanning, shared with bluscan2.py
+def add_watch_arguments(parser):
+    parser.add_argument('--watch', action='store_true',
+                        help='Scan continuously and print aggregated results periodically instead of one snapshot')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between reports (default: %(default)s)')
+    parser.add_argument('--duration', type=float, help='Stop watching after this many seconds (default: run until Ctrl+C)')
+    parser.add_argument('--buffer', type=int, default=32,
+                        help='Advertisements kept per device address (default: %(default)s)')
+    parser.add_argument('--forget-after', type=float, default=300,
+                        help='Drop devices not heard from for this many seconds (default: %(default)s)')
+    parser.add_argument('--record', help='Append every advertisement to this NDJSON file for later replay')
+    parser.add_argument('--replay', help='Replay advertisements from a --record file instead of scanning (implies --watch)')
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed multiplier (default: %(default)s)')
+
+def watch_from_args(args, report=print_report):
+    if args.replay:
+        make_scanner = lambda callback: ReplayScanner(args.replay, callback, args.speed)
+    elif BleakScanner is None:
+        raise SystemExit("Scanning needs bleak (pip install bleak)")
+    else:
+        make_scanner = None
+    try:
+        return asyncio.run(scan_continuous(args.interval, args.duration, args.buffer, args.forget_after,
+                                           make_scanner, report, args.record))
+    except KeyboardInterrupt:
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan for Bluetooth LE devices.")
+    add_watch_arguments(parser)
+    args = parser.parse_args()
+
+    if args.watch or args.replay:
+        watch_from_args(args)
+    elif BleakScanner is None:
+        raise SystemExit("Scanning needs bleak (pip install bleak)")
+    else:
+        # Run the scanner
+        asyncio.run(scan_devices())
+
+if __name__ == "__main__":
+    main()
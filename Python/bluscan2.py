@@ -1,11 +1,17 @@
+import argparse
 import asyncio
-from bleak import BleakScanner
 import math
 
+from bluscan import BleakScanner, add_watch_arguments, watch_from_args
+
 # Constants: known RSSI at 1 meter and known distance
 A = -78  # RSSI at 1 meter (from device at 1 meter)
 n = 2    # Path loss exponent (2 is typical in free space, but adjust based on environment)
 
+# Calculate the estimated distance from an RSSI using the path loss model
+def estimate_distance(rssi):
+    return 10 ** ((A - rssi) / (10 * n))
+
 async def scan_bluetooth_devices():
     devices = await BleakScanner.discover()
     print("Found {} device(s):".format(len(devices)))
@@ -13,16 +19,39 @@ async def scan_bluetooth_devices():
         rssi = device.rssi  # Use device.rssi directly
 
         if rssi is not None:
-            # Calculate the estimated distance using the RSSI
-            distance = 10 ** ((A - rssi) / (10 * n))  # Apply the path loss model
+            distance = estimate_distance(rssi)
             print(f"Device Address: {device.address}, Device Name: {device.name}, RSSI: {rssi}")
             print(f"Estimated Distance: {distance:.2f} meters\n")
         else:
             print(f"Device Address: {device.address}, Device Name: {device.name}, RSSI: No data\n")
 
+# Periodic report for continuous scans. The distance uses the mean RSSI over
+# each device's buffered advertisements, which is much steadier than any
+# single reading.
+def print_distances(history, summaries):
+    print("Found {} device(s), {} advertisement(s) received:".format(len(summaries), history.received))
+    for device in summaries:
+        if device.mean_rssi is not None:
+            print(f"Device Address: {device.address}, Device Name: {device.name}, "
+                  f"RSSI: {device.last_rssi} (avg {device.mean_rssi:.1f} over {device.count})")
+            print(f"Estimated Distance: {estimate_distance(device.mean_rssi):.2f} meters\n")
+        else:
+            print(f"Device Address: {device.address}, Device Name: {device.name}, RSSI: No data\n")
+    print("-" * 40)
+
 async def main():
     print("Scanning for Bluetooth devices...")
     await scan_bluetooth_devices()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Scan for Bluetooth LE devices and estimate their distance.")
+    add_watch_arguments(parser)
+    args = parser.parse_args()
+
+    if args.watch or args.replay:
+        print("Watching for Bluetooth devices (Ctrl+C to stop)...")
+        watch_from_args(args, print_distances)
+    elif BleakScanner is None:
+        raise SystemExit("Scanning needs bleak (pip install bleak)")
+    else:
+        asyncio.run(main())
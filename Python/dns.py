@@ -1,17 +1,394 @@
 #!/usr/bin/env python
 
 # Import the necessary packages
-import os
+import argparse
+import asyncio
+import ipaddress
+import json
+import random
+import shutil
+import socket
+import string
+import struct
 import subprocess
+import time
 
-# Set the domain that needs to be scanned
-domain = 'DOMAIN'
+# DNS record types that can be queried and decoded
+record_types = {'A': 1, 'NS': 2, 'CNAME': 5, 'SOA': 6, 'PTR': 12, 'MX': 15, 'TXT': 16, 'AAAA': 28}
+record_names = {number: name for name, number in record_types.items()}
 
-# Perform a DNSRecon scan on the domain
-subprocess.call('dnsrecon -d %s -t std' % domain, shell=True)
+# Record types looked up for a domain by default
+default_types = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'SOA']
 
-# Perform a DNSenum scan on the domain
-subprocess.call('dnsenum %s' % domain, shell=True)
+# How long to cache a negative answer when the server gives no SOA minimum
+negative_ttl = 60
 
-# Perform a WhoIs call on the domain
-subprocess.call('whois %s' % domain, shell=True)
+# Function to read the system's nameservers, falling back to a public resolver
+def system_nameservers():
+    nameservers = []
+    try:
+        with open('/etc/resolv.conf') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == 'nameserver':
+                    nameservers.append(parts[1])
+    except OSError:
+        pass
+    return nameservers or ['8.8.8.8']
+
+# Function to write an IP address the way the socket layer reports it
+def canonical_address(address):
+    try:
+        return str(ipaddress.ip_address(address))
+    except ValueError:
+        return address
+
+# Function to pick the socket family for a nameserver address
+def address_family(address):
+    return socket.AF_INET6 if ':' in address else socket.AF_INET
+
+# Function to encode a domain name in DNS wire format
+def encode_name(name):
+    encoded = b''
+    for label in name.rstrip('.').split('.'):
+        if label:
+            label = label.encode('ascii') if label.isascii() else label.encode('idna')
+            encoded += bytes([len(label)]) + label
+    return encoded + b'\0'
+
+# Function to build a recursive query packet
+def build_query(qid, name, qtype):
+    header = struct.pack('!HHHHHH', qid, 0x0100, 1, 0, 0, 0)
+    return header + encode_name(name) + struct.pack('!HH', record_types[qtype], 1)
+
+# Function to read a (possibly compressed) name, returning it and the offset
+# just past it in the original position
+def read_name(data, offset):
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            jumps += 1
+            if jumps > 64:
+                raise ValueError("Compression loop in DNS name")
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+        elif length == 0:
+            offset += 1
+            break
+        else:
+            labels.append(data[offset + 1:offset + 1 + length].decode('ascii', errors='replace'))
+            offset += 1 + length
+    return '.'.join(labels), end if end is not None else offset
+
+# Function to decode the data of a single resource record
+def decode_rdata(data, offset, rdlength, rtype):
+    rdata = data[offset:offset + rdlength]
+    if rtype == 1:
+        return socket.inet_ntop(socket.AF_INET, rdata)
+    if rtype == 28:
+        return socket.inet_ntop(socket.AF_INET6, rdata)
+    if rtype in (2, 5, 12):
+        return read_name(data, offset)[0]
+    if rtype == 15:
+        preference = struct.unpack('!H', rdata[:2])[0]
+        return f"{preference} {read_name(data, offset + 2)[0]}"
+    if rtype == 16:
+        strings = []
+        position = 0
+        while position < len(rdata):
+            length = rdata[position]
+            strings.append(rdata[position + 1:position + 1 + length].decode('utf-8', errors='replace'))
+            position += 1 + length
+        return ''.join(strings)
+    if rtype == 6:
+        mname, position = read_name(data, offset)
+        rname, position = read_name(data, position)
+        serial, refresh, retry, expire, minimum = struct.unpack('!IIIII', data[position:position + 20])
+        return f"{mname} {rname} {serial} {refresh} {retry} {expire} {minimum}"
+    return rdata.hex()
+
+# Function to parse a response into its id, flags and answer/authority
+# records, each record being (name, type, ttl, value)
+def parse_response(data):
+    qid, flags, qdcount, ancount, nscount, _ = struct.unpack('!HHHHHH', data[:12])
+    offset = 12
+    for _ in range(qdcount):
+        offset = read_name(data, offset)[1] + 4
+
+    sections = []
+    for count in (ancount, nscount):
+        records = []
+        for _ in range(count):
+            name, offset = read_name(data, offset)
+            rtype, _, ttl, rdlength = struct.unpack('!HHIH', data[offset:offset + 10])
+            offset += 10
+            records.append((name, record_names.get(rtype, str(rtype)), ttl, decode_rdata(data, offset, rdlength, rtype)))
+            offset += rdlength
+        sections.append(records)
+
+    return {
+        "id": qid,
+        "rcode": flags & 0x000F,
+        "truncated": bool(flags & 0x0200),
+        "answers": sections[0],
+        "authority": sections[1]
+    }
+
+# Datagram protocol handing each response to the query waiting on its id.
+# A response is only accepted from the nameserver the query was sent to and
+# when it repeats the query's question, so a late reply to a timed-out query
+# whose id has been reused cannot answer a different name.
+class _ResolverProtocol(asyncio.DatagramProtocol):
+    def __init__(self, waiting):
+        self.waiting = waiting
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12:
+            return
+        qid = struct.unpack('!H', data[:2])[0]
+        waiting = self.waiting.get(qid)
+        if not waiting:
+            return
+        future, server, question = waiting
+        if tuple(addr[:2]) != server or struct.unpack('!H', data[4:6])[0] != 1:
+            return
+        if data[12:12 + len(question)].lower() != question:
+            return
+        del self.waiting[qid]
+        if not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        pass
+
+# Asynchronous stub resolver sharing one UDP socket between every query,
+# with a bounded in-flight window and a TTL-based response cache
+class DnsResolver:
+    def __init__(self, nameservers=None, port=53, concurrency=500, timeout=2.0, retries=2):
+        # Kept in canonical form so they compare equal to response source addresses
+        self.nameservers = [canonical_address(nameserver) for nameserver in nameservers or system_nameservers()]
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.concurrency = concurrency
+        self.semaphore = None
+        self.transports = {}
+        self.waiting = {}
+        self.pending = {}
+        self.cache = {}
+        self.queries_sent = 0
+
+    async def start(self):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        # One socket per address family in use, so IPv4 and IPv6
+        # nameservers can be mixed
+        for family in {address_family(nameserver) for nameserver in self.nameservers}:
+            self.transports[family], _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: _ResolverProtocol(self.waiting), family=family)
+
+    def close(self):
+        for transport in self.transports.values():
+            transport.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    # Look a name up, returning (rcode, answer records). Concurrent lookups
+    # of the same name share a single query.
+    async def query(self, name, qtype='A'):
+        key = (name.lower().rstrip('.'), qtype)
+        cached = self.cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+
+        if key in self.pending:
+            return await asyncio.shield(self.pending[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+        try:
+            response = await self._resolve(name, qtype)
+            if response is None:
+                result = (None, [])
+            else:
+                result = (response["rcode"], response["answers"])
+                self.cache[key] = (time.monotonic() + self._ttl(response),) + result
+            future.set_result(result)
+            return result
+        finally:
+            if not future.done():
+                future.set_result((None, []))
+            del self.pending[key]
+
+    # Cache answers for their smallest TTL and negative answers for the SOA minimum
+    @staticmethod
+    def _ttl(response):
+        if response["answers"]:
+            return min(record[2] for record in response["answers"])
+        for record in response["authority"]:
+            if record[1] == 'SOA':
+                return min(record[2], int(record[3].split()[-1]))
+        return negative_ttl
+
+    async def _resolve(self, name, qtype):
+        async with self.semaphore:
+            for attempt in range(self.retries + 1):
+                nameserver = self.nameservers[attempt % len(self.nameservers)]
+                qid = random.randrange(65536)
+                while qid in self.waiting:
+                    qid = random.randrange(65536)
+                packet = build_query(qid, name, qtype)
+
+                future = asyncio.get_running_loop().create_future()
+                self.waiting[qid] = (future, (nameserver, self.port), packet[12:].lower())
+                self.queries_sent += 1
+                self.transports[address_family(nameserver)].sendto(packet, (nameserver, self.port))
+                try:
+                    data = await asyncio.wait_for(future, self.timeout)
+                except asyncio.TimeoutError:
+                    continue
+                finally:
+                    self.waiting.pop(qid, None)
+
+                try:
+                    response = parse_response(data)
+                except (ValueError, IndexError, struct.error):
+                    continue
+                if response["truncated"]:
+                    response = await self._resolve_tcp(nameserver, packet, response)
+                return response
+        return None
+
+    # Retry a truncated response over TCP, keeping the truncated answer if that fails
+    async def _resolve_tcp(self, nameserver, packet, truncated):
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(nameserver, self.port), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            return truncated
+        try:
+            writer.write(struct.pack('!H', len(packet)) + packet)
+            await writer.drain()
+            length = struct.unpack('!H', await asyncio.wait_for(reader.readexactly(2), self.timeout))[0]
+            return parse_response(await asyncio.wait_for(reader.readexactly(length), self.timeout))
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return truncated
+        finally:
+            writer.close()
+
+# Function to look up the standard record types for a domain
+async def lookup_records(resolver, domain, types=default_types):
+    results = await asyncio.gather(*(resolver.query(domain, qtype) for qtype in types))
+    records = []
+    for qtype, (rcode, answers) in zip(types, results):
+        records.extend(answer for answer in answers if answer[1] == qtype)
+    return records
+
+# Function to find the addresses a wildcard record answers with, by
+# resolving labels that cannot exist
+async def detect_wildcard(resolver, domain, probes=3):
+    addresses = set()
+    for _ in range(probes):
+        label = ''.join(random.choices(string.ascii_lowercase + string.digits, k=16))
+        rcode, answers = await resolver.query(f"{label}.{domain}", 'A')
+        addresses.update(answer[3] for answer in answers if answer[1] == 'A')
+    return addresses
+
+# Function to brute force subdomains from a wordlist, skipping names that
+# only resolve to the wildcard addresses
+async def brute_force(resolver, domain, words, wildcard=frozenset()):
+    found = []
+    words = iter(words)
+
+    async def worker():
+        for word in words:
+            word = word.strip()
+            if not word or word.startswith('#'):
+                continue
+            name = f"{word}.{domain}"
+            rcode, answers = await resolver.query(name, 'A')
+            addresses = {answer[3] for answer in answers if answer[1] == 'A'}
+            if addresses and not addresses <= wildcard:
+                found.append({"name": name, "addresses": sorted(addresses),
+                              "cnames": [answer[3] for answer in answers if answer[1] == 'CNAME']})
+
+    # Workers pull from the shared word iterator so memory stays bounded
+    # no matter how long the wordlist is
+    await asyncio.gather(*(worker() for _ in range(resolver.concurrency)))
+    return sorted(found, key=lambda entry: entry["name"])
+
+# Function to run a full enumeration of a domain
+async def scan_domain(domain, wordlist=None, nameservers=None, port=53, concurrency=500, timeout=2.0,
+                      types=default_types):
+    start = time.monotonic()
+    async with DnsResolver(nameservers, port, concurrency, timeout) as resolver:
+        records = await lookup_records(resolver, domain, types)
+        wildcard = set()
+        subdomains = []
+        if wordlist:
+            wildcard = await detect_wildcard(resolver, domain)
+            with open(wordlist) as f:
+                subdomains = await brute_force(resolver, domain, f, wildcard)
+
+    return {
+        "domain": domain,
+        "records": [{"name": name, "type": rtype, "ttl": ttl, "value": value} for name, rtype, ttl, value in records],
+        "wildcard": sorted(wildcard),
+        "subdomains": subdomains,
+        "queries": resolver.queries_sent,
+        "elapsed": round(time.monotonic() - start, 3)
+    }
+
+# Function to format an enumeration result as readable lines
+def format_results(results):
+    for record in results["records"]:
+        yield f"{record['type']:6} {record['name']} {record['value']} (TTL {record['ttl']})"
+    if results["wildcard"]:
+        yield f"Wildcard DNS detected: {', '.join(results['wildcard'])}"
+    for subdomain in results["subdomains"]:
+        yield f"Found {subdomain['name']} -> {', '.join(subdomain['addresses'])}"
+    yield f"{results['queries']} queries in {results['elapsed']}s"
+
+def main():
+    parser = argparse.ArgumentParser(description="Asynchronous DNS enumeration of a domain with optional subdomain brute forcing.")
+    parser.add_argument('domain', help='Domain to enumerate (e.g., example.com)')
+    parser.add_argument('--wordlist', help='File of subdomain labels to brute force, one per line')
+    parser.add_argument('--nameserver', action='append', help='Nameserver to query; may be repeated (default: system resolvers)')
+    parser.add_argument('--port', type=int, default=53, help='Nameserver port (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=500, help='Maximum queries in flight (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=2.0, help='Seconds to wait for each response (default: %(default)s)')
+    parser.add_argument('--types', default=','.join(default_types),
+                        help='Comma-separated record types to look up (default: %(default)s)')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--no-whois', action='store_true', help='Skip the WhoIs lookup after the enumeration')
+    args = parser.parse_args()
+
+    types = [qtype.strip().upper() for qtype in args.types.split(',') if qtype.strip()]
+    unknown = [qtype for qtype in types if qtype not in record_types]
+    if unknown:
+        parser.error(f"Unsupported record types: {', '.join(unknown)}")
+
+    results = asyncio.run(scan_domain(args.domain, args.wordlist, args.nameserver, args.port,
+                                      args.concurrency, args.timeout, types))
+    for line in format_results(results):
+        print(line)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+
+    # Perform a WhoIs call on the domain
+    if not args.no_whois:
+        if shutil.which('whois'):
+            subprocess.call(['whois', args.domain])
+        else:
+            print("whois is not installed; skipping the WhoIs lookup")
+
+if __name__ == "__main__":
+    main()
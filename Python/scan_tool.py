@@ -2,138 +2,1051 @@
 
 # Import the necessary packages
 import os
+import errno
+import resource
 import subprocess
 import shutil
+import signal
 import argparse
+import asyncio
 import logging
 import json
+import hashlib
+import ipaddress
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-# Set up logging
-logging.basicConfig(filename='scan_tool.log', level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+from ListIPs import host_blocks, hosts_in_networks
 
-# Check if the necessary tools are installed
-required_tools = ['nmap', 'dnsrecon', 'dnsenum', 'whois', 'sslscan', 'nikto']
-for tool in required_tools:
-    if not shutil.which(tool):
-        logging.error(f"Tool {tool} is not installed. Please install it.")
-        print(f"Tool {tool} is not installed. Please install it.")
-        exit(1)
+# How many runs of a single scanner may run at once, by concurrency class.
+# Every scanner gets its own slots, so nmap and nikto cannot starve each other.
+concurrency_classes = {
+    'heavy': 1,
+    'medium': 2,
+    'light': 4,
+}
 
-# Parse command-line arguments
-parser = argparse.ArgumentParser(
-    description="Initial Domain/IP Scanning Tool - This tool runs a series of scans on a given domain or IP, including Nmap, DNSRecon, DNSenum, and more. Use the flags to specify which scans to perform."
-)
-
-parser.add_argument('--domain', help='Domain to scan (e.g., example.com)')
-parser.add_argument('--ip', help='IP address to scan (e.g., 192.168.1.1)')
-parser.add_argument('--scan', choices=['nmap', 'dnsrecon', 'dnsenum', 'whois', 'sslscan', 'nikto', 'all'],
-                    default='all', help='Specify which scan to perform. Options are: '
-                                         '"nmap" (Nmap scan), "dnsrecon" (DNSRecon scan), "dnsenum" (DNSenum scan), '
-                                         '"whois" (WhoIs lookup), "sslscan" (SSL/TLS scan), "nikto" (Nikto vulnerability scan), or "all" (all scans).')
-
-args = parser.parse_args()
-
-# Prompt for domain and IP if not provided via arguments
-domain = args.domain if args.domain else input("Enter the domain (press Enter to skip): ")
-IP = args.ip if args.ip else input("Enter the IP address (press Enter to skip): ")
-
-# Skip operations if no input is provided
-if not domain and not IP:
-    logging.warning("No domain or IP provided. Skipping...")
-    print("No domain or IP provided. Skipping...")
-    exit(0)
-
-# Prepare the report data
-report = {
-    "domain": domain,
-    "ip": IP,
-    "scan_time": str(datetime.now()),
-    "results": {}
+# Declarative scanner definition:
+#   description  shown in --help
+#   target       'domain' or 'ip'
+#   executable   external program that must be installed, or None
+#   command      argument template filled from {target}, the structured
+#                output path ({xml_file}/{json_file}) and scanner extras
+#   structured   extension of the structured output the parser reads, or None
+#   parser       name of the function turning that output into records
+#   scan         name of a custom scan function, for scanners that need more
+#                than running their command
+#   timeout      seconds before the run is terminated (None for no limit)
+#   concurrency  concurrency class
+#   cache_ttl    seconds results may be reused (None to never cache)
+#   default      included in --scan all
+Scanner = namedtuple('Scanner', ['description', 'target', 'executable', 'command', 'structured', 'parser', 'scan',
+                                 'timeout', 'concurrency', 'cache_ttl', 'default'],
+                     defaults=(None, None, None, None, 'medium', None, True))
+
+# Registry of every scanner. Adding a tool only takes an entry here (plus a
+# parser if its output should reach the result store).
+scanners = {
+    'nmap': Scanner(
+        description='Nmap service/OS scan of the ports found open by a TCP connect sweep',
+        target='ip', executable='nmap',
+        command=['sudo', 'nmap', '-sS', '-Pn', '-n', '-T4', '-p', '{ports}', '-sV', '-O', '-oX', '{xml_file}', '{target}'],
+        structured='xml', parser='parse_nmap_xml', scan='nmap_scan', concurrency='heavy'),
+    'dns': Scanner(
+        description='native asynchronous DNS enumeration',
+        target='domain', executable=None, command=['dns', '{target}'],
+        structured='json', parser='parse_dns_json', scan='dns_scan', concurrency='light', cache_ttl=3600),
+    'dnsrecon': Scanner(
+        description='DNSRecon scan',
+        target='domain', executable='dnsrecon', command=['dnsrecon', '-d', '{target}', '-t', 'std', '-j', '{json_file}'],
+        structured='json', parser='parse_dnsrecon_json', timeout=1800, cache_ttl=3600, default=False),
+    'dnsenum': Scanner(
+        description='DNSenum scan',
+        target='domain', executable='dnsenum', command=['dnsenum', '{target}'],
+        timeout=1800, cache_ttl=3600, default=False),
+    'whois': Scanner(
+        description='WhoIs lookup',
+        target='domain', executable='whois', command=['whois', '{target}'],
+        timeout=120, concurrency='light', cache_ttl=7 * 24 * 3600),
+    'sslscan': Scanner(
+        description='SSL/TLS scan',
+        target='domain', executable='sslscan', command=['sslscan', '--xml={xml_file}', '{target}'],
+        structured='xml', parser='parse_sslscan_xml', timeout=600, cache_ttl=24 * 3600),
+    'nikto': Scanner(
+        description='Nikto vulnerability scan',
+        target='domain', executable='nikto', command=['nikto', '-h', '{target}'],
+        timeout=7200, concurrency='heavy'),
 }
 
-# Function to perform a DNSRecon scan
-def dnsrecon_scan():
-    try:
-        logging.info(f"Performing DNSRecon scan on domain: {domain}")
-        result = subprocess.check_output(f'dnsrecon -d {domain} -t std', shell=True)
-        report["results"]["dnsrecon"] = result.decode()
-    except Exception as e:
-        logging.error(f"Error performing DNSRecon scan: {e}")
-
-# Function to perform a DNSenum scan
-def dnsenum_scan():
-    try:
-        logging.info(f"Performing DNSenum scan on domain: {domain}")
-        result = subprocess.check_output(f'dnsenum {domain}', shell=True)
-        report["results"]["dnsenum"] = result.decode()
-    except Exception as e:
-        logging.error(f"Error performing DNSenum scan: {e}")
-
-# Function to perform a WhoIs query
-def whois_query():
-    try:
-        logging.info(f"Performing WhoIs query on domain: {domain}")
-        result = subprocess.check_output(f'whois {domain}', shell=True)
-        report["results"]["whois"] = result.decode()
-    except Exception as e:
-        logging.error(f"Error performing WhoIs query: {e}")
-
-# Function to perform an Nmap scan
-def nmap_scan():
-    try:
-        logging.info(f"Performing stealth Nmap port scan on IP: {IP}")
-        result = subprocess.check_output(f'sudo nmap -sS -Pn -n -T4 -p- -sV -O {IP}', shell=True)
-        report["results"]["nmap"] = result.decode()
-    except Exception as e:
-        logging.error(f"Error performing Nmap scan: {e}")
-
-# Function to perform an SSL scan
-def ssl_scan():
+# Scanners run by --scan all
+default_scans = [name for name, scanner in scanners.items() if scanner.default]
+
+# Per-scanner concurrency slots, plus the port sweep that precedes nmap
+tool_semaphores = {name: threading.BoundedSemaphore(concurrency_classes[scanner.concurrency])
+                   for name, scanner in scanners.items()}
+tool_semaphores['sweep'] = threading.BoundedSemaphore(concurrency_classes['light'])
+
+# Cap on scans running at once across all tools and targets; set from
+# --workers in main()
+scan_slots = threading.BoundedSemaphore(len(scanners))
+
+# One thread pool per scanner, sized to its concurrency slots, so scans
+# queued behind a busy tool never hold threads another tool needs. The nmap
+# pool is sized for the connect sweeps that run ahead of it.
+class ScanExecutors:
+    def __init__(self):
+        self.executors = {}
+        for name, scanner in scanners.items():
+            size = concurrency_classes[scanner.concurrency]
+            if name == 'nmap':
+                size = max(size, concurrency_classes['light'])
+            self.executors[name] = ThreadPoolExecutor(max_workers=size, thread_name_prefix=name)
+
+    def submit(self, tool, fn, *args):
+        return self.executors[tool].submit(fn, *args)
+
+    def shutdown(self):
+        for executor in self.executors.values():
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+# Function to resolve a scanner's scan function, falling back to running its
+# command template
+def scan_function(name):
+    scanner = scanners[name]
+    return globals()[scanner.scan] if scanner.scan else partial(run_scanner, name)
+
+# Function to resolve a scanner's result parser, if it has one
+def result_parser(name):
+    scanner = scanners.get(name)
+    return globals()[scanner.parser] if scanner and scanner.parser else None
+
+# On-disk cache of completed tool runs keyed on (tool, target, arguments).
+# The output files of a cached run are copied into a directory owned by the
+# cache, so later runs rewriting the spool files cannot change what a hit
+# returns.
+class ScanCache:
+    def __init__(self, db_path, refresh=False):
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.files_dir = os.path.splitext(db_path)[0] + '_files'
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS cache (
+            key TEXT PRIMARY KEY, tool TEXT, target TEXT, created REAL, result TEXT)""")
+
+    # Build the cache key, replacing output paths with their role so runs
+    # into different output directories share entries
+    @staticmethod
+    def make_key(tool, target, command, artifacts):
+        key_args = list(command)
+        for name, path in artifacts.items():
+            key_args = [arg.replace(path, f'{{{name}}}') for arg in key_args]
+        return json.dumps([tool, target, key_args])
+
+    # Directory holding the files of one cache entry
+    def entry_dir(self, key):
+        return os.path.join(self.files_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    # Return the cached result if it is fresh and its files are still the
+    # cache's own, unchanged copies
+    def get(self, tool, key):
+        if self.refresh:
+            return None
+        with self.lock:
+            row = self.connection.execute("SELECT created, result FROM cache WHERE key = ?", (key,)).fetchone()
+        if not row or time.time() - row[0] > scanners[tool].cache_ttl:
+            return None
+        result = json.loads(row[1])
+        entry_dir = self.entry_dir(key)
+        for name, path in result.items():
+            if not name.endswith('_file'):
+                continue
+            if os.path.dirname(path) != entry_dir or not os.path.exists(path):
+                return None
+        if os.path.getsize(result["output_file"]) != result["bytes"]:
+            return None
+        return result
+
+    # Copy the run's files into the cache and store the result pointing at
+    # the copies
+    def put(self, tool, target, key, result):
+        files = {name: path for name, path in result.items() if name.endswith('_file')}
+        if not all(os.path.exists(path) for path in files.values()):
+            return
+        entry_dir = self.entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        cached = dict(result)
+        for name, path in files.items():
+            cached[name] = os.path.join(entry_dir, os.path.basename(path))
+            shutil.copyfile(path, cached[name])
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                                    (key, tool, target, time.time(), json.dumps(cached)))
+
+    def close(self):
+        self.connection.close()
+
+# Cache used by run_tool; set up in main()
+result_cache = None
+
+# Collects per-run timing and resource metrics, optionally appending each
+# run to an NDJSON metrics file, and keeps per-tool totals for the summary
+class ScanMetrics:
+    def __init__(self, metrics_file=None):
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.file = open(metrics_file, 'a') if metrics_file else None
+
+    def record(self, target, tool, metrics):
+        with self.lock:
+            totals = self.totals.setdefault(tool, {
+                "runs": 0, "failures": 0, "timeouts": 0, "wall_seconds": 0.0, "max_wall_seconds": 0.0,
+                "cpu_seconds": 0.0, "max_rss_kb": 0, "output_bytes": 0
+            })
+            totals["runs"] += 1
+            totals["failures"] += metrics["exit_code"] != 0
+            totals["timeouts"] += metrics["timed_out"]
+            totals["wall_seconds"] += metrics["wall_seconds"]
+            totals["max_wall_seconds"] = max(totals["max_wall_seconds"], metrics["wall_seconds"])
+            totals["cpu_seconds"] += metrics["cpu_seconds"]
+            totals["max_rss_kb"] = max(totals["max_rss_kb"], metrics.get("max_rss_kb") or 0)
+            totals["output_bytes"] += metrics["output_bytes"]
+            if self.file:
+                self.file.write(json.dumps(dict(metrics, target=target, tool=tool, time=str(datetime.now()))) + '\n')
+                self.file.flush()
+
+    # Function to format the per-tool totals as a table, slowest tool first
+    def summary(self):
+        lines = [f"{'Tool':10} {'Runs':>5} {'Fail':>5} {'T/O':>4} {'Wall s':>10} {'Max s':>9} {'CPU s':>9} "
+                 f"{'Max RSS MB':>10} {'Output MB':>10}"]
+        for tool, totals in sorted(self.totals.items(), key=lambda item: -item[1]["wall_seconds"]):
+            lines.append(f"{tool:10} {totals['runs']:>5} {totals['failures']:>5} {totals['timeouts']:>4} "
+                         f"{totals['wall_seconds']:>10.2f} {totals['max_wall_seconds']:>9.2f} "
+                         f"{totals['cpu_seconds']:>9.2f} {totals['max_rss_kb'] / 1024:>10.1f} "
+                         f"{totals['output_bytes'] / 1048576:>10.2f}")
+        return '\n'.join(lines)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+# Metrics collector used by run_tool; set up in main()
+scan_metrics = None
+
+# Function to tell whether a scan step ran to completion
+def step_succeeded(result):
+    return result.get("exit_code") == 0 and not result.get("metrics", {}).get("timed_out")
+
+# Append-only NDJSON journal of completed scan steps and targets, flushed
+# after every entry so an interrupted run can be resumed with --resume
+class ScanJournal:
+    def __init__(self, path, resume=False):
+        self.lock = threading.Lock()
+        self.completed_steps = {}
+        self.completed_targets = set()
+        if resume and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by the interruption
+                        continue
+                    target = (entry["domain"], entry["ip"])
+                    if entry["event"] == 'step' and step_succeeded(entry["result"]):
+                        self.completed_steps.setdefault(target, {})[entry["tool"]] = (entry["result"], entry["elapsed"])
+                    elif entry["event"] == 'target':
+                        self.completed_targets.add(target)
+        self.file = open(path, 'a' if resume else 'w')
+        # Finish a line cut short by the interruption so the next entry
+        # starts on a line of its own
+        if resume and self.file.tell() > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self.file.write('\n')
+
+    def _write(self, entry):
+        with self.lock:
+            self.file.write(json.dumps(entry) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def step_done(self, domain, IP, tool):
+        return self.completed_steps.get((domain, IP), {}).get(tool)
+
+    def target_done(self, domain, IP):
+        return (domain, IP) in self.completed_targets
+
+    # Only steps that succeeded are recorded, so a scan killed by the
+    # interruption is run again on resume
+    def record_step(self, domain, IP, tool, result, elapsed):
+        if not step_succeeded(result):
+            return
+        self._write({"event": 'step', "domain": domain, "ip": IP, "tool": tool, "result": result, "elapsed": elapsed})
+
+    def record_target(self, domain, IP, report_path):
+        self._write({"event": 'target', "domain": domain, "ip": IP, "report": report_path})
+
+    def close(self):
+        self.file.close()
+
+# Checkpoint journal used by run_scans and run_batch; set up in main()
+scan_journal = None
+
+# Options for the native scanners; set up in main()
+scan_options = {
+    'timeout': None,
+    'wordlist': None,
+    'nameservers': None,
+    'sweep': True,
+    'ports': '1-65535',
+    'sweep_concurrency': 500,
+    'sweep_timeout': 1.0,
+}
+
+# Function to run a tool under its concurrency cap, streaming its output
+# straight into a spool file so nothing is buffered in memory and partial
+# output survives if the scan is interrupted. Extra output files the tool
+# writes are passed in artifacts and referenced from the result. Native
+# scanners pass a runner that writes to the spool file and returns an exit
+# code; their command is then only used as the cache key.
+def run_tool(tool, target, command, spool_path, artifacts=None, runner=None):
+    artifacts = artifacts or {}
+    start = time.monotonic()
+
+    key = None
+    if result_cache and scanners[tool].cache_ttl:
+        key = ScanCache.make_key(tool, target, command, artifacts)
+    if key:
+        cached = result_cache.get(tool, key)
+        if cached:
+            logging.info(f"Using cached {tool} results for {target}")
+            return dict(cached, cache='hit'), time.monotonic() - start
+
+    with tool_semaphores[tool], scan_slots:
+        start = time.monotonic()
+        with open(spool_path, 'wb') as spool_file:
+            if runner:
+                cpu_start = time.thread_time()
+                exit_code = runner(spool_file)
+                metrics = {"cpu_seconds": time.thread_time() - cpu_start}
+                timed_out = False
+            else:
+                timeout = scan_options['timeout'] or scanners[tool].timeout
+                exit_code, timed_out, metrics = run_process(command, spool_file, timeout)
+        elapsed = time.monotonic() - start
+
+    if timed_out:
+        logging.error(f"{tool} timed out after {elapsed:.2f}s and was terminated")
+    elif exit_code != 0:
+        logging.error(f"{tool} exited with code {exit_code} after {elapsed:.2f}s")
+    result = {
+        "output_file": spool_path,
+        "bytes": os.path.getsize(spool_path),
+        "exit_code": exit_code
+    }
+    result.update(artifacts)
+    if key and exit_code == 0 and not timed_out:
+        result_cache.put(tool, target, key, result)
+    if key:
+        result["cache"] = 'miss'
+
+    metrics = dict(metrics, wall_seconds=elapsed, output_bytes=result["bytes"], exit_code=exit_code, timed_out=timed_out)
+    result["metrics"] = {name: round(value, 3) if isinstance(value, float) else value for name, value in metrics.items()}
+    if scan_metrics:
+        scan_metrics.record(target, tool, result["metrics"])
+    return result, elapsed
+
+# Seconds a timed-out tool gets to exit after SIGTERM before it is killed
+kill_grace_seconds = 5
+
+# Function to run a command with its output going to spool_file, sending it
+# SIGTERM after timeout seconds and SIGKILL if it is still running
+# kill_grace_seconds later. The child is reaped with wait4() so its CPU time
+# and peak memory are its own even while other scans run concurrently.
+def run_process(command, spool_file, timeout=None):
+    process = subprocess.Popen(command, stdout=spool_file, stderr=subprocess.STDOUT)
+    expired = threading.Event()
+    exited = threading.Event()
+    lock = threading.Lock()
+
+    # Signal the child directly rather than through Popen, which could reap
+    # it before wait4() does; once it has exited its pid may be reused
+    def send(signum):
+        with lock:
+            if not exited.is_set():
+                try:
+                    os.kill(process.pid, signum)
+                except OSError as e:
+                    logging.error(f"Could not stop {command[0]} (pid {process.pid}): {e}")
+
+    def terminate():
+        expired.set()
+        send(signal.SIGTERM)
+        if not exited.wait(kill_grace_seconds):
+            send(signal.SIGKILL)
+
+    timer = threading.Timer(timeout, terminate) if timeout else None
+    if timer:
+        timer.daemon = True
+        timer.start()
     try:
-        logging.info(f"Performing SSL/TLS scan on domain: {domain}")
-        result = subprocess.check_output(f'sslscan {domain}', shell=True)
-        report["results"]["sslscan"] = result.decode()
-    except Exception as e:
-        logging.error(f"Error performing SSL scan: {e}")
-
-# Function to perform a Nikto vulnerability scan
-def nikto_scan():
+        # Wait without reaping so the pid stays ours until no more signals
+        # can be sent
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+        with lock:
+            exited.set()
+        _, status, usage = os.wait4(process.pid, 0)
+    finally:
+        exited.set()
+        if timer:
+            timer.cancel()
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    metrics = {
+        "cpu_seconds": usage.ru_utime + usage.ru_stime,
+        "cpu_user_seconds": usage.ru_utime,
+        "cpu_system_seconds": usage.ru_stime,
+        "max_rss_kb": usage.ru_maxrss
+    }
+    return process.returncode, expired.is_set(), metrics
+
+# Function to run a scanner by filling in its command template. Its
+# structured output, if any, is written next to the spool file.
+def run_scanner(name, target, spool_path, extra_args=(), **fields):
+    scanner = scanners[name]
+    logging.info(f"Performing {scanner.description} on {scanner.target}: {target}")
+    artifacts = {}
+    if scanner.structured:
+        artifacts[f"{scanner.structured}_file"] = f"{os.path.splitext(spool_path)[0]}.{scanner.structured}"
+    command = [arg.format(target=target, **artifacts, **fields) for arg in scanner.command] + list(extra_args)
+    return run_tool(name, target, command, spool_path, artifacts)
+
+# Function to perform a native asynchronous DNS enumeration. The engine is
+# only imported when this scanner is selected.
+def dns_scan(domain, spool_path):
+    import dns as dns_engine
+
+    logging.info(f"Performing native DNS enumeration on domain: {domain}")
+    json_path = os.path.splitext(spool_path)[0] + '.json'
+    wordlist = scan_options['wordlist']
+    command = [arg.format(target=domain) for arg in scanners['dns'].command]
+    if wordlist:
+        command += ['--wordlist', wordlist]
+    for nameserver in scan_options['nameservers'] or ():
+        command += ['--nameserver', nameserver]
+
+    def runner(spool_file):
+        results = asyncio.run(dns_engine.scan_domain(domain, wordlist, scan_options['nameservers']))
+        with open(json_path, 'w') as f:
+            json.dump(results, f, indent=4)
+        for line in dns_engine.format_results(results):
+            spool_file.write(f"{line}\n".encode())
+        return 0
+
+    return run_tool('dns', domain, command, spool_path, {'json_file': json_path}, runner)
+
+# Function to turn a port specification such as "22,80,8000-8100" into a
+# sorted list of ports
+def parse_ports(spec):
+    ports = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = (int(port) for port in part.split('-', 1))
+            ports.update(range(first, last + 1))
+        else:
+            ports.add(int(part))
+    if not ports or min(ports) < 1 or max(ports) > 65535:
+        raise ValueError(f"Invalid port specification: {spec}")
+    return sorted(ports)
+
+# Errors meaning the process ran out of file descriptors rather than that
+# the port is closed
+fd_exhausted_errors = (errno.EMFILE, errno.ENFILE)
+
+# Function to find open TCP ports with plain connect() calls, keeping at
+# most `concurrency` connection attempts in flight. Returns the open ports
+# and one port that refused the connection, if any, for Nmap's OS detection.
+# Running out of file descriptors backs off and retries the port, and
+# raises if it persists, so no open port is ever reported as closed.
+async def port_sweep(host, ports, concurrency=500, timeout=1.0, retries=5):
+    open_ports = []
+    closed_ports = []
+    ports = iter(ports)
+
+    async def probe(port):
+        for attempt in range(retries + 1):
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+            except asyncio.TimeoutError:
+                return
+            except OSError as e:
+                if e.errno not in fd_exhausted_errors:
+                    if isinstance(e, ConnectionRefusedError) and not closed_ports:
+                        closed_ports.append(port)
+                    return
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(0.1 * 2 ** attempt)
+            else:
+                open_ports.append(port)
+                writer.close()
+                return
+
+    async def worker():
+        for port in ports:
+            await probe(port)
+
+    # Workers pull from the shared port iterator so only `concurrency`
+    # probes exist at any time
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(open_ports), closed_ports[0] if closed_ports else None
+
+# Function to cap the connections in flight per sweep so that every sweep
+# allowed to run at once fits in the open file limit, leaving room for
+# spool files, databases and child processes
+def sweep_concurrency_limit(requested, reserved=128):
+    soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft_limit == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, (soft_limit - reserved) // concurrency_classes['light']))
+
+# Function to perform an Nmap scan. A TCP connect sweep finds the open ports
+# first so service and OS detection only run against those.
+def nmap_scan(IP, spool_path):
+    if not scan_options['sweep']:
+        return run_scanner('nmap', IP, spool_path, ports='1-65535')
+
+    logging.info(f"Performing TCP connect sweep on IP: {IP}")
+    with tool_semaphores['sweep']:
+        start = time.monotonic()
+        cpu_start = time.thread_time()
+        open_ports, closed_port = asyncio.run(port_sweep(IP, parse_ports(scan_options['ports']),
+                                                         scan_options['sweep_concurrency'],
+                                                         scan_options['sweep_timeout']))
+        sweep_elapsed = time.monotonic() - start
+    if scan_metrics:
+        scan_metrics.record(IP, 'sweep', {"wall_seconds": sweep_elapsed, "cpu_seconds": time.thread_time() - cpu_start,
+                                          "output_bytes": 0, "exit_code": 0, "timed_out": False})
+    logging.info(f"TCP connect sweep found {len(open_ports)} open ports on IP: {IP} in {sweep_elapsed:.2f}s")
+
+    if not open_ports:
+        with open(spool_path, 'w') as spool_file:
+            spool_file.write(f"No open TCP ports found on {IP} by the connect sweep; Nmap was not run.\n")
+        result = {"output_file": spool_path, "bytes": os.path.getsize(spool_path), "exit_code": 0}
+        elapsed = 0
+    else:
+        # OS detection needs a closed port as well as the open ones
+        nmap_ports = open_ports + ([closed_port] if closed_port else [])
+        result, elapsed = run_scanner('nmap', IP, spool_path, ports=','.join(str(port) for port in nmap_ports))
+
+    result["open_ports"] = open_ports
+    result["sweep_seconds"] = round(sweep_elapsed, 3)
+    return result, sweep_elapsed + elapsed
+
+# Typed records produced by the result parsers
+PortRecord = namedtuple('PortRecord', ['host', 'port', 'protocol', 'state', 'service', 'product', 'version'])
+FindingRecord = namedtuple('FindingRecord', ['host', 'port', 'tool', 'finding', 'detail'])
+DnsRecord = namedtuple('DnsRecord', ['name', 'type', 'value'])
+
+# Ciphers that are reported as weak by the sslscan parser
+weak_cipher_markers = ('NULL', 'EXP', 'RC4', 'DES-CBC-', 'MD5', 'anon')
+
+# Function to parse Nmap XML output (-oX) into port and OS records
+def parse_nmap_xml(xml_path):
+    ports, findings = [], []
+    for host in ET.parse(xml_path).getroot().iter('host'):
+        address = host.find('address')
+        if address is None:
+            continue
+        addr = address.get('addr')
+        for port in host.iter('port'):
+            state = port.find('state')
+            service = port.find('service')
+            ports.append(PortRecord(
+                addr,
+                int(port.get('portid')),
+                port.get('protocol'),
+                state.get('state') if state is not None else None,
+                service.get('name') if service is not None else None,
+                service.get('product') if service is not None else None,
+                service.get('version') if service is not None else None
+            ))
+        for osmatch in host.iter('osmatch'):
+            findings.append(FindingRecord(addr, None, 'nmap', 'os', f"{osmatch.get('name')} ({osmatch.get('accuracy')}%)"))
+    return ports, findings, []
+
+# Function to parse sslscan XML output (--xml) into protocol, cipher and
+# certificate findings
+def parse_sslscan_xml(xml_path):
+    findings = []
+    for test in ET.parse(xml_path).getroot().iter('ssltest'):
+        host = test.get('sniname') or test.get('host')
+        port = int(test.get('port', 443))
+        for protocol in test.iter('protocol'):
+            if protocol.get('enabled') == '1':
+                name = f"{protocol.get('type', '').upper()}v{protocol.get('version')}"
+                findings.append(FindingRecord(host, port, 'sslscan', name, 'protocol enabled'))
+        for cipher in test.iter('cipher'):
+            name = cipher.get('cipher', '')
+            if int(cipher.get('bits', 0) or 0) < 128 or any(marker in name for marker in weak_cipher_markers):
+                findings.append(FindingRecord(host, port, 'sslscan', 'weak-cipher', f"{cipher.get('sslversion')} {name}"))
+        for heartbleed in test.iter('heartbleed'):
+            if heartbleed.get('vulnerable') == '1':
+                findings.append(FindingRecord(host, port, 'sslscan', 'heartbleed', heartbleed.get('sslversion')))
+        for certificate in test.iter('certificate'):
+            if certificate.findtext('expired') == 'true':
+                findings.append(FindingRecord(host, port, 'sslscan', 'certificate-expired', certificate.findtext('not-valid-after')))
+            if certificate.findtext('self-signed') == 'true':
+                findings.append(FindingRecord(host, port, 'sslscan', 'certificate-self-signed', certificate.findtext('subject')))
+    return [], findings, []
+
+# Function to parse DNSRecon JSON output (-j) into DNS records
+def parse_dnsrecon_json(json_path):
+    records = []
+    with open(json_path) as f:
+        for entry in json.load(f):
+            record_type = entry.get('type')
+            if record_type in (None, 'ScanInfo'):
+                continue
+            value = (entry.get('address') or entry.get('target') or entry.get('exchange')
+                     or entry.get('strings') or entry.get('mname'))
+            records.append(DnsRecord(entry.get('name') or entry.get('domain'), record_type, value))
+    return [], [], records
+
+# Function to parse the native DNS engine's JSON output into DNS records
+def parse_dns_json(json_path):
+    with open(json_path) as f:
+        results = json.load(f)
+    records = [DnsRecord(record["name"], record["type"], record["value"]) for record in results["records"]]
+    for subdomain in results["subdomains"]:
+        records.extend(DnsRecord(subdomain["name"], 'A', address) for address in subdomain["addresses"])
+    return [], [], records
+
+# Local SQLite store of parsed results, indexed for lookups across every
+# scan ever loaded into it
+class ResultStore:
+    schema = """
+        CREATE TABLE IF NOT EXISTS scans (
+            id INTEGER PRIMARY KEY, target TEXT, domain TEXT, ip TEXT, tool TEXT, scan_time TEXT);
+        CREATE TABLE IF NOT EXISTS ports (
+            scan_id INTEGER, target TEXT, host TEXT, port INTEGER, protocol TEXT, state TEXT,
+            service TEXT, product TEXT, version TEXT);
+        CREATE TABLE IF NOT EXISTS findings (
+            scan_id INTEGER, target TEXT, host TEXT, port INTEGER, tool TEXT, finding TEXT, detail TEXT);
+        CREATE TABLE IF NOT EXISTS dns_records (
+            scan_id INTEGER, target TEXT, name TEXT, type TEXT, value TEXT);
+        CREATE INDEX IF NOT EXISTS ports_host ON ports (host);
+        CREATE INDEX IF NOT EXISTS ports_port ON ports (port, state);
+        CREATE INDEX IF NOT EXISTS ports_service ON ports (service);
+        CREATE INDEX IF NOT EXISTS ports_target ON ports (target, port);
+        CREATE INDEX IF NOT EXISTS findings_finding ON findings (finding);
+        CREATE INDEX IF NOT EXISTS findings_host ON findings (host, port);
+        CREATE INDEX IF NOT EXISTS findings_target ON findings (target, port);
+        CREATE INDEX IF NOT EXISTS dns_records_name ON dns_records (name, type);
+        CREATE INDEX IF NOT EXISTS dns_records_value ON dns_records (value);
+    """
+
+    def __init__(self, db_path):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.executescript(self.schema)
+
+    # Parse every structured artifact in a report and load the records
+    def load_report(self, report):
+        target = report["domain"] if report["domain"] else report["ip"]
+        for tool, result in report["results"].items():
+            # Cached results were already loaded by the run that produced them
+            parser = result_parser(tool)
+            if not parser or result.get("cache") == 'hit':
+                continue
+            key = f"{scanners[tool].structured}_file"
+            if key not in result:
+                continue
+            try:
+                ports, findings, dns_records = parser(result[key])
+            except (OSError, ValueError, ET.ParseError) as e:
+                logging.error(f"Error parsing {tool} output for {target}: {e}")
+                continue
+
+            with self.lock, self.connection:
+                scan_id = self.connection.execute(
+                    "INSERT INTO scans (target, domain, ip, tool, scan_time) VALUES (?, ?, ?, ?, ?)",
+                    (target, report["domain"], report["ip"], tool, report["scan_time"])).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO ports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(scan_id, target) + tuple(record) for record in ports])
+                self.connection.executemany(
+                    "INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(scan_id, target) + tuple(record) for record in findings])
+                self.connection.executemany(
+                    "INSERT INTO dns_records VALUES (?, ?, ?, ?, ?)",
+                    [(scan_id, target) + tuple(record) for record in dns_records])
+
+    # Find ports matching every given filter. A finding filter matches
+    # findings reported for the same target and port (e.g. port 443 with
+    # TLSv1.0 enabled).
+    def query(self, host=None, port=None, service=None, finding=None, state='open'):
+        sql = """SELECT DISTINCT p.target, p.host, p.port, p.protocol, p.service, p.product, p.version,
+                        f.finding, f.detail
+                 FROM ports p {join} findings f ON f.target = p.target AND f.port = p.port
+                 WHERE 1 = 1"""
+        params = []
+        if host:
+            sql += " AND (p.host = ? OR p.target = ?)"
+            params += [host, host]
+        if port is not None:
+            sql += " AND p.port = ?"
+            params.append(port)
+        if service:
+            sql += " AND p.service = ?"
+            params.append(service)
+        if state:
+            sql += " AND p.state = ?"
+            params.append(state)
+        if finding:
+            sql += " AND f.finding = ?"
+            params.append(finding)
+        sql = sql.format(join='JOIN' if finding else 'LEFT JOIN')
+        with self.lock:
+            return self.connection.execute(sql + " ORDER BY p.target, p.port", params).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+# Function to run the selected scans concurrently and collect the report
+def run_scans(domain, IP, selected, executors, output_dir='.'):
+    report = {
+        "domain": domain,
+        "ip": IP,
+        "scan_time": str(datetime.now()),
+        "results": {},
+        "timings": {},
+        "cache": {"hits": [], "misses": []},
+        "resumed": []
+    }
+    targets = {'domain': domain, 'ip': IP}
+
+    # Each tool's output is spooled to scan_output/<target>/<tool>.txt
+    spool_dir = os.path.join(output_dir, 'scan_output', domain if domain else IP)
+    os.makedirs(spool_dir, exist_ok=True)
+
+    start = time.monotonic()
+    futures = {}
+    for tool in selected:
+        scan, target_type = scan_function(tool), scanners[tool].target
+        if not targets[target_type]:
+            continue
+
+        # Steps finished before an interruption are taken from the journal
+        completed = scan_journal.step_done(domain, IP, tool) if scan_journal else None
+        if completed:
+            report["results"][tool], report["timings"][tool] = completed
+            report["resumed"].append(tool)
+        else:
+            spool_path = os.path.join(spool_dir, f"{tool}.txt")
+            futures[executors.submit(tool, scan, targets[target_type], spool_path)] = tool
+
+    for future in as_completed(futures):
+        tool = futures[future]
+        try:
+            result, elapsed = future.result()
+            if scan_journal:
+                scan_journal.record_step(domain, IP, tool, result, round(elapsed, 3))
+            report["results"][tool] = result
+            report["timings"][tool] = round(elapsed, 3)
+            if result.get("cache") == 'hit':
+                report["cache"]["hits"].append(tool)
+            elif result.get("cache") == 'miss':
+                report["cache"]["misses"].append(tool)
+        except Exception as e:
+            logging.error(f"Error performing {tool} scan: {e}")
+
+    report["timings"]["total"] = round(time.monotonic() - start, 3)
+    return report
+
+# Function to refuse an IPv6 network with more than max_ipv6 host addresses,
+# as ListIPs.py does
+def check_network_size(subnet, max_ipv6):
+    ipv6_count = sum(block.num_addresses for block in host_blocks([subnet]) if block.version == 6)
+    if ipv6_count > max_ipv6:
+        raise ValueError(f"{subnet} holds {ipv6_count} IPv6 addresses, more than the limit of {max_ipv6} "
+                         f"(see --max-ipv6)")
+
+# Function to expand a target file and CIDR list into (domain, IP) pairs.
+# Each target file line is a domain, an IP, a CIDR or "domain,IP". Every
+# network is checked before the first target is returned, so an oversized
+# IPv6 range fails the batch up front instead of part way through.
+def load_targets(targets_file=None, cidrs=(), max_ipv6=1 << 24):
+    lines = []
+    if targets_file:
+        with open(targets_file) as f:
+            lines = [line for line in (line.split('#', 1)[0].strip() for line in f) if line]
+    for subnet in [line for line in lines if ',' not in line and '/' in line] + list(cidrs):
+        check_network_size(subnet, max_ipv6)
+    return expand_targets(lines, cidrs)
+
+def expand_targets(lines, cidrs):
+    for line in lines:
+        if ',' in line:
+            domain, IP = (part.strip() for part in line.split(',', 1))
+            yield domain, IP
+        elif '/' in line:
+            for host in hosts_in_networks([line]):
+                yield '', host
+        else:
+            try:
+                yield '', str(ipaddress.ip_address(line))
+            except ValueError:
+                yield line, ''
+
+    for host in hosts_in_networks(cidrs):
+        yield '', host
+
+# Function to save a target's report and return its file name
+def save_report(report, output_dir='.'):
+    target = report["domain"] if report["domain"] else report["ip"]
+    report_path = os.path.join(output_dir, f"scan_report_{target}.json")
+    with open(report_path, 'w') as report_file:
+        json.dump(report, report_file, indent=4)
+    return report_path
+
+# Function to scan many targets, keeping at most max_targets in flight and
+# saving each report as soon as its target finishes
+def run_batch(targets, selected, executors, max_targets, output_dir='.', store=None):
+    in_flight = threading.BoundedSemaphore(max_targets)
+    count = 0
+
+    def scan_target(domain, IP):
+        try:
+            report = run_scans(domain, IP, selected, executors, output_dir)
+            report_path = save_report(report, output_dir)
+            if store:
+                store.load_report(report)
+            if scan_journal:
+                scan_journal.record_target(domain, IP, report_path)
+            logging.info(f"Scan completed for domain: {domain} and IP: {IP} in {report['timings']['total']}s")
+            print(f"Scan report saved to {report_path}")
+        except Exception as e:
+            logging.error(f"Error scanning domain: {domain} and IP: {IP}: {e}")
+        finally:
+            in_flight.release()
+
+    # Targets get their own pool so waiting on scans never blocks the scan workers
+    with ThreadPoolExecutor(max_workers=max_targets) as target_executor:
+        for domain, IP in targets:
+            if scan_journal and scan_journal.target_done(domain, IP):
+                logging.info(f"Skipping completed target domain: {domain} and IP: {IP}")
+                continue
+            in_flight.acquire()
+            target_executor.submit(scan_target, domain, IP)
+            count += 1
+
+    return count
+
+# Function to turn a --scan value such as "dns,whois" into scanner names
+def parse_scan_selection(value):
+    if value == 'all':
+        return list(default_scans)
+    selected = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in scanners]
+    if not selected or unknown:
+        raise argparse.ArgumentTypeError(f"unknown scan(s): {', '.join(unknown) or value}")
+    return list(dict.fromkeys(selected))
+
+# Function to print and log the per-tool metrics summary
+def print_metrics_summary():
+    if not scan_metrics.totals:
+        return
+    summary = scan_metrics.summary()
+    logging.info(f"Scan metrics summary:\n{summary}")
+    print(f"\n{summary}")
+    scan_metrics.close()
+
+def main():
+    # Set up logging
+    logging.basicConfig(filename='scan_tool.log', level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(
+        description="Initial Domain/IP Scanning Tool - This tool runs a series of scans on a given domain or IP, including Nmap, DNSRecon, DNSenum, and more. Use the flags to specify which scans to perform."
+    )
+
+    parser.add_argument('--domain', help='Domain to scan (e.g., example.com)')
+    parser.add_argument('--ip', help='IP address to scan (e.g., 192.168.1.1)')
+    parser.add_argument('--targets-file',
+                        help='File with one target per line: a domain, an IP, a CIDR or "domain,IP" (enables batch mode)')
+    parser.add_argument('--cidr', action='append', default=[],
+                        help='Network to scan every host of (e.g., 192.168.1.0/24); may be repeated (enables batch mode)')
+    parser.add_argument('--scan', type=parse_scan_selection, default='all',
+                        help='Comma-separated scans to perform. Options are: ' +
+                             ', '.join(f'"{name}" ({scanner.description})' for name, scanner in scanners.items()) +
+                             f', or "all" ({", ".join(default_scans)}).')
+    parser.add_argument('--ports', default='1-65535',
+                        help='Ports for the TCP connect sweep before Nmap, e.g. "1-1024,8080" (default: %(default)s)')
+    parser.add_argument('--sweep-concurrency', type=int, default=500,
+                        help='Maximum connection attempts in flight per host during the sweep, lowered if needed '
+                             'to fit the open file limit (default: %(default)s)')
+    parser.add_argument('--sweep-timeout', type=float, default=1.0,
+                        help='Seconds to wait for each connection during the sweep (default: %(default)s)')
+    parser.add_argument('--no-sweep', action='store_true',
+                        help='Skip the connect sweep and let Nmap scan every port itself')
+    parser.add_argument('--wordlist', help='Subdomain wordlist for the native DNS brute force')
+    parser.add_argument('--nameserver', action='append',
+                        help='Nameserver for the native DNS scan; may be repeated (default: system resolvers)')
+    parser.add_argument('--workers', type=int, default=len(scanners),
+                        help='Maximum number of scans running at once across all tools and targets (default: %(default)s)')
+    parser.add_argument('--max-ipv6', type=int, default=1 << 24,
+                        help='Refuse IPv6 networks in batch mode with more host addresses than this (default: %(default)s)')
+    parser.add_argument('--max-targets', type=int, default=4,
+                        help='Maximum number of targets scanned at once in batch mode (default: %(default)s)')
+    parser.add_argument('--output-dir', default='.',
+                        help='Directory to write scan reports and spooled tool output to (default: current directory)')
+    parser.add_argument('--db', help='SQLite result store to load parsed results into '
+                                     '(default: scan_results.db in the output directory)')
+    parser.add_argument('--no-db', action='store_true', help='Do not load parsed results into the result store')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore cached results and rerun every selected scan (fresh results are still cached)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the result cache')
+    parser.add_argument('--timeout', type=float,
+                        help='Seconds any external tool may run before it is terminated (default: per-tool limits)')
+    parser.add_argument('--metrics-file', help='Append per-run timing and resource metrics to this NDJSON file')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume an interrupted run from the journal in the output directory, '
+                             'skipping targets and scans that already completed')
+    parser.add_argument('--query', action='store_true',
+                        help='Query the result store instead of scanning, filtered by the --query-* options')
+    parser.add_argument('--query-host', help='Only show results for this host or target')
+    parser.add_argument('--query-port', type=int, help='Only show results for this port (e.g., 443)')
+    parser.add_argument('--query-service', help='Only show results for this service (e.g., https)')
+    parser.add_argument('--query-finding', help='Only show ports with this finding (e.g., TLSv1.0, weak-cipher, heartbleed)')
+
+    args = parser.parse_args()
     try:
-        logging.info(f"Performing Nikto vulnerability scan on domain: {domain}")
-        result = subprocess.check_output(f'nikto -h {domain}', shell=True)
-        report["results"]["nikto"] = result.decode()
-    except Exception as e:
-        logging.error(f"Error performing Nikto scan: {e}")
-
-# Run selected scans
-if args.scan == 'all' or args.scan == 'nmap':
-    if IP:
-        nmap_scan()
-
-if args.scan == 'all' or args.scan == 'dnsrecon':
-    if domain:
-        dnsrecon_scan()
-
-if args.scan == 'all' or args.scan == 'dnsenum':
-    if domain:
-        dnsenum_scan()
-
-if args.scan == 'all' or args.scan == 'whois':
-    if domain:
-        whois_query()
-
-if domain:
-    ssl_scan()
-    nikto_scan()
-
-# Save the results to a file
-with open(f"scan_report_{domain if domain else IP}.json", 'w') as report_file:
-    json.dump(report, report_file, indent=4)
-
-# Log the completion of the scan
-logging.info(f"Scan completed for domain: {domain} and IP: {IP}")
-
-# Provide feedback to the user
-print(f"Scan report saved to scan_report_{domain if domain else IP}.json")
+        parse_ports(args.ports)
+    except ValueError as e:
+        parser.error(str(e))
+    selected = args.scan
+    os.makedirs(args.output_dir, exist_ok=True)
+    db_path = args.db if args.db else os.path.join(args.output_dir, 'scan_results.db')
+
+    # Query mode: look results up in the store and exit
+    if args.query:
+        store = ResultStore(db_path)
+        rows = store.query(args.query_host, args.query_port, args.query_service, args.query_finding)
+        store.close()
+        for target, host, port, protocol, service, product, version, finding, detail in rows:
+            service_info = ' '.join(part for part in (service, product, version) if part)
+            finding_info = f"  [{finding}: {detail}]" if finding else ''
+            print(f"{target} ({host}) {port}/{protocol} {service_info}{finding_info}")
+        print(f"{len(rows)} result(s)")
+        return
+
+    # Check that the tools needed by the selected scans are installed,
+    # dropping any that are missing so the rest can still run
+    for name in list(selected):
+        tool = scanners[name].executable
+        if tool and not shutil.which(tool):
+            logging.error(f"Tool {tool} is not installed. Skipping the {name} scan.")
+            print(f"Tool {tool} is not installed. Skipping the {name} scan.")
+            selected.remove(name)
+    if not selected:
+        print("None of the selected scans can run. Please install the missing tools.")
+        exit(1)
+
+    store = None if args.no_db else ResultStore(db_path)
+
+    scan_options['wordlist'] = args.wordlist
+    scan_options['nameservers'] = args.nameserver
+    scan_options['sweep'] = not args.no_sweep
+    scan_options['ports'] = args.ports
+    scan_options['sweep_concurrency'] = sweep_concurrency_limit(args.sweep_concurrency)
+    if scan_options['sweep_concurrency'] < args.sweep_concurrency:
+        logging.warning(f"Sweep concurrency lowered to {scan_options['sweep_concurrency']} to fit the open file limit")
+    scan_options['sweep_timeout'] = args.sweep_timeout
+
+    # Collect timing and resource metrics for every tool run
+    global scan_metrics, scan_journal, result_cache, scan_slots
+    scan_metrics = ScanMetrics(args.metrics_file)
+    scan_slots = threading.BoundedSemaphore(args.workers)
+    scan_options['timeout'] = args.timeout
+
+    # Record every completed step so an interrupted run can be resumed
+    scan_journal = ScanJournal(os.path.join(args.output_dir, 'scan_journal.ndjson'), args.resume)
+
+    # Reuse recent whois/DNS/SSL results unless told otherwise
+    if not args.no_cache:
+        result_cache = ScanCache(os.path.join(args.output_dir, 'scan_cache.db'), args.refresh)
+
+    # Batch mode: expand the target file and CIDRs and fan them out
+    if args.targets_file or args.cidr:
+        try:
+            targets = load_targets(args.targets_file, args.cidr, args.max_ipv6)
+            with ScanExecutors() as executors:
+                count = run_batch(targets, selected, executors, args.max_targets, args.output_dir, store)
+            if store:
+                store.close()
+        except (OSError, ValueError) as e:
+            logging.error(f"Error loading targets: {e}")
+            print(f"Error loading targets: {e}")
+            exit(1)
+        logging.info(f"Batch scan completed for {count} targets")
+        print(f"Batch scan completed for {count} targets")
+        print_metrics_summary()
+        return
+
+    # Prompt for domain and IP if not provided via arguments
+    domain = args.domain if args.domain else input("Enter the domain (press Enter to skip): ")
+    IP = args.ip if args.ip else input("Enter the IP address (press Enter to skip): ")
+
+    # Skip operations if no input is provided
+    if not domain and not IP:
+        logging.warning("No domain or IP provided. Skipping...")
+        print("No domain or IP provided. Skipping...")
+        exit(0)
+
+    # A target the journal records as finished was already saved and loaded
+    # into the result store
+    if scan_journal.target_done(domain, IP):
+        logging.info(f"Skipping completed target domain: {domain} and IP: {IP}")
+        print(f"Scan of domain: {domain} and IP: {IP} already completed; nothing to resume.")
+        if store:
+            store.close()
+        return
+
+    # Run selected scans
+    with ScanExecutors() as executors:
+        report = run_scans(domain, IP, selected, executors, args.output_dir)
+
+    # Save the results to a file and load them into the result store
+    report_path = save_report(report, args.output_dir)
+    if store:
+        store.load_report(report)
+        store.close()
+    scan_journal.record_target(domain, IP, report_path)
+
+    # Log the completion of the scan
+    logging.info(f"Scan completed for domain: {domain} and IP: {IP} in {report['timings']['total']}s")
+
+    # Provide feedback to the user
+    print(f"Scan report saved to {report_path}")
+    print_metrics_summary()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import datetime
+
+import pytest
+
+pyarrow = pytest.importorskip('pyarrow')
+import pyarrow.parquet
+
+from XLSXtoCSV import write_parquet
+
+# A number column holding only whole numbers in the first row group must
+# keep a later 19.99 instead of truncating it to 19
+def test_parquet_keeps_float_after_int_row_group(tmp_path):
+    output_file = tmp_path / 'sheet.parquet'
+    rows = iter([('id', 'amount')] + [(index, index * 10) for index in range(4)] + [(4, 19.99)])
+    write_parquet('Data', rows, str(output_file), chunk_rows=2)
+
+    table = pyarrow.parquet.read_table(output_file)
+    assert table.schema.field('amount').type == pyarrow.float64()
+    assert table.column('amount').to_pylist() == [0, 10, 20, 30, 19.99]
+
+# A number arriving in a date column must fail instead of becoming a 1970 date
+def test_parquet_rejects_type_change_after_first_row_group(tmp_path):
+    output_file = tmp_path / 'sheet.parquet'
+    rows = iter([('created',), (datetime.datetime(2020, 1, 1),), (datetime.datetime(2020, 1, 2),), (5,)])
+    with pytest.raises(ValueError, match="changes a column's type"):
+        write_parquet('Data', rows, str(output_file), chunk_rows=2)
+    assert not output_file.exists()
+
+# Values of different types in one row group make the column text instead of
+# being cast to the first value's type
+@pytest.mark.parametrize('values', [
+    [datetime.datetime(2020, 1, 1), 5],
+    [datetime.time(1, 2), 3],
+    [datetime.timedelta(hours=1), 5],
+    [datetime.timedelta(hours=30), 1e20],
+])
+def test_parquet_mixed_types_in_one_row_group_become_text(tmp_path, values):
+    output_file = tmp_path / 'sheet.parquet'
+    write_parquet('Data', iter([('value',)] + [(value,) for value in values]), str(output_file))
+
+    table = pyarrow.parquet.read_table(output_file)
+    assert table.schema.field('value').type == pyarrow.string()
+    assert table.column('value').to_pylist() == [str(value) for value in values]